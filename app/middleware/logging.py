@@ -4,6 +4,7 @@ from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 import logging
 import json
+import uuid
 
 # Configure logging
 logging.basicConfig(
@@ -21,6 +22,9 @@ class LoggingMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         # Record start time
         start_time = time.time()
+
+        # Reuse the caller's X-Request-ID (allowed by CORS) or mint one
+        request.state.request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
         
         # Get request details
         path = request.url.path
@@ -2,6 +2,7 @@ from sqlalchemy import Column, String, Integer, Float, JSON, DateTime, ForeignKe
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from typing import Iterable, Mapping
 import uuid
 import enum
 
@@ -51,6 +52,16 @@ class SupplyTemplate(Base):
     # Relationships
     disaster_type = relationship("DisasterType", back_populates="supply_templates")
 
+    @staticmethod
+    def compute_total_weight(items: Iterable[InventoryItem], quantities: Mapping[uuid.UUID, float]) -> float:
+        """Total weight in grams of ``quantities`` ({item_id: quantity}) of ``items``."""
+        return sum(item.weight_grams * quantities[item.id] for item in items)
+
+    @property
+    def items(self):
+        """Template line items, as exposed by ``SupplyTemplateResponse``."""
+        return self.items_json
+
     def __repr__(self):
         return f"<SupplyTemplate {self.name} - {self.total_weight_grams}g>"
 
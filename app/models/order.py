@@ -49,5 +49,13 @@ class OrderItem(Base):
     order = relationship("Order", back_populates="items")
     item = relationship("InventoryItem", lazy="joined")
 
+    @property
+    def item_name(self):
+        return self.item.name
+
+    @property
+    def item_weight_grams(self):
+        return self.item.weight_grams
+
     def __repr__(self):
         return f"<OrderItem {self.item_id} - {self.quantity}>"
\ No newline at end of file
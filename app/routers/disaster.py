@@ -9,6 +9,8 @@ from app.db import get_db
 from app.models.disaster import Disaster, DisasterType, Location, DisasterStatus
 from app.models.user import UserRole
 from app.schemas.disaster import (
+    DisasterTypeCreate,
+    DisasterTypeResponse,
     DisasterCreate,
     DisasterResponse,
     LocationCreate,
@@ -19,6 +21,30 @@ from app.utils.auth import get_current_user, check_role
 
 router = APIRouter(tags=["disasters"])
 
+@router.post("/disaster-types", response_model=DisasterTypeResponse)
+async def create_disaster_type(
+    disaster_type: DisasterTypeCreate,
+    db: AsyncSession = Depends(get_db),
+    _current_user = Depends(check_role(UserRole.ADMIN))
+):
+    # Names are unique
+    result = await db.execute(
+        select(DisasterType).filter(DisasterType.name == disaster_type.name)
+    )
+    if result.scalar_one_or_none():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Disaster type already exists"
+        )
+    
+    db_disaster_type = DisasterType(**disaster_type.dict())
+    
+    db.add(db_disaster_type)
+    await db.commit()
+    await db.refresh(db_disaster_type)
+    
+    return db_disaster_type
+
 @router.post("/disasters", response_model=DisasterResponse)
 async def create_disaster(
     disaster: DisasterCreate,
@@ -43,7 +69,8 @@ async def create_disaster(
     
     db.add(db_disaster)
     await db.commit()
-    await db.refresh(db_disaster)
+    # Load disaster_type too; DisasterResponse nests it
+    await db.refresh(db_disaster, ["disaster_type"])
     
     return db_disaster
 
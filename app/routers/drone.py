@@ -117,7 +117,8 @@ async def create_mission(
     drone.status = DroneStatus.IN_MISSION
     
     await db.commit()
-    await db.refresh(db_mission)
+    # Load waypoints too; MissionResponse nests them
+    await db.refresh(db_mission, ["waypoints"])
     return db_mission
 
 @router.get("/missions/{mission_id}", response_model=MissionResponse)
@@ -71,7 +71,6 @@ async def create_supply_template(
     _current_user = Depends(check_role(UserRole.ADMIN))
 ):
     # Verify all items exist and calculate total weight
-    total_weight = 0
     items_to_check = {item.item_id: item.quantity for item in template.items}
     
     result = await db.execute(
@@ -87,14 +86,13 @@ async def create_supply_template(
         )
     
     # Calculate total weight
-    for item in found_items:
-        total_weight += item.weight_grams * items_to_check[item.id]
+    total_weight = SupplyTemplate.compute_total_weight(found_items, items_to_check)
     
     # Create template
     db_template = SupplyTemplate(
         name=template.name,
         disaster_type_id=template.disaster_type_id,
-        items_json=[item.dict() for item in template.items],
+        items_json=[item.model_dump(mode="json") for item in template.items],
         total_weight_grams=total_weight
     )
     
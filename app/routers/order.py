@@ -87,8 +87,14 @@ async def create_order(
         db.add(db_item)
     
     await db.commit()
-    await db.refresh(db_order)
-    return db_order
+    
+    # Reload with the line items OrderResponse nests
+    result = await db.execute(
+        select(Order).options(
+            joinedload(Order.items).joinedload(OrderItem.item)
+        ).filter(Order.id == db_order.id)
+    )
+    return result.unique().scalar_one()
 
 @router.get("/orders", response_model=List[OrderResponse])
 async def list_orders(
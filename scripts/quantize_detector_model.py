@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Convert a MobileNet SSD SavedModel into a full-integer (INT8) TFLite model.
+
+Run on a workstation with TensorFlow installed, not on the Pi:
+
+    python scripts/quantize_detector_model.py \
+        --saved_model_dir path/to/saved_model \
+        --calibration_dir path/to/drone_frames \
+        --output models/mobilenet_ssd_v1_int8.tflite
+
+Calibration uses up to --num_samples frames (jpg/png) from the drone camera so
+activation ranges match what the detector actually sees. The resulting model
+takes a uint8 [1, H, W, 3] RGB input, which detector.py feeds straight from
+its preprocess buffer with no float conversion.
+
+Detection heads: SSD exports that end in TFLite_Detection_PostProcess already
+emit normalized boxes and float scores. For heads that concatenate raw pixel
+xywh boxes with class scores into one tensor, normalize the boxes by the image
+size before the concat; otherwise per-tensor quantization is dominated by the
+large box values and the scores collapse to zero.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Iterator, List
+
+import cv2  # type: ignore
+import numpy as np
+
+
+# SavedModel float input ranges, mapped from 0..255 pixels
+INPUT_RANGES = {"0,1": (0.0, 1.0), "-1,1": (-1.0, 1.0), "0,255": (0.0, 255.0)}
+
+
+def load_calibration_frames(calibration_dir: Path, size: int, num_samples: int) -> List[np.ndarray]:
+    paths = sorted(p for p in calibration_dir.iterdir() if p.suffix.lower() in (".jpg", ".jpeg", ".png"))
+    frames = []
+    for path in paths[:num_samples]:
+        bgr = cv2.imread(str(path))
+        if bgr is None:
+            continue
+        resized = cv2.resize(bgr, (size, size), interpolation=cv2.INTER_LINEAR)
+        frames.append(cv2.cvtColor(resized, cv2.COLOR_BGR2RGB))
+    return frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Full-integer quantization for the obstacle detector model")
+    parser.add_argument("--saved_model_dir", type=Path, required=True)
+    parser.add_argument("--calibration_dir", type=Path, required=True, help="Directory of representative frames")
+    parser.add_argument("--output", type=Path, default=Path("models/mobilenet_ssd_v1_int8.tflite"))
+    parser.add_argument("--input_size", type=int, default=300)
+    parser.add_argument("--num_samples", type=int, default=100)
+    parser.add_argument(
+        "--input_range",
+        choices=sorted(INPUT_RANGES),
+        default="-1,1",
+        help="Float input range the SavedModel expects (MobileNet SSD: -1,1)",
+    )
+    args = parser.parse_args()
+
+    import tensorflow as tf  # type: ignore  # Workstation-only dependency
+
+    frames = load_calibration_frames(args.calibration_dir, args.input_size, args.num_samples)
+    if not frames:
+        print(f"Error: no calibration images found in {args.calibration_dir}")
+        sys.exit(1)
+    print(f"Calibrating with {len(frames)} frames")
+
+    lo, hi = INPUT_RANGES[args.input_range]
+
+    def representative_dataset() -> Iterator[List[np.ndarray]]:
+        for rgb in frames:
+            x = np.expand_dims(rgb, axis=0).astype(np.float32)
+            yield [lo + x * ((hi - lo) / 255.0)]
+
+    converter = tf.lite.TFLiteConverter.from_saved_model(str(args.saved_model_dir))
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset
+    converter.target_spec.supported_ops = [
+        tf.lite.OpsSet.TFLITE_BUILTINS_INT8,
+        tf.lite.OpsSet.TFLITE_BUILTINS,  # Detection post-processing stays float
+    ]
+    converter.inference_input_type = tf.uint8
+
+    tflite_model = converter.convert()
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_bytes(tflite_model)
+    print(f"Wrote {args.output} ({len(tflite_model) / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,10 +23,12 @@ Usage:
 """
 
 import argparse
-import json
+import functools
 import logging
 import logging.handlers
+import math
 import os
+import random
 import signal
 import sys
 import time
@@ -35,6 +37,7 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
 import paho.mqtt.client as mqtt  # type: ignore
 
 
@@ -77,6 +80,17 @@ class MissionState(Enum):
     PAUSED = "PAUSED"
 
 
+# States in which the mission can be paused (by command or obstacle)
+_PAUSEABLE_STATES = frozenset({MissionState.ENROUTE, MissionState.HOLD})
+
+# Simulated telemetry "mission" section: (mission_id, state, waypoint,
+# progress_percent), and the section sent while idle. Sections are never
+# mutated once built, so packets can share them
+_MISSION_SECTION_KEYS = ("mission_id", "state", "waypoint", "progress_percent")
+_IDLE_MISSION_FIELDS = (None, MissionState.IDLE.value, 0, 0)
+_IDLE_MISSION_SECTION: Dict[str, Any] = dict(zip(_MISSION_SECTION_KEYS, _IDLE_MISSION_FIELDS))
+
+
 @dataclass
 class Waypoint:
     """Mission waypoint definition."""
@@ -123,6 +137,62 @@ class MissionStatus:
     error_message: Optional[str] = None
 
 
+@functools.lru_cache(maxsize=8)
+def _decode_mission(raw: bytes) -> Tuple[Tuple[Any, ...], Tuple[Tuple[Any, ...], ...]]:
+    """Decode mission JSON bytes into immutable field tuples.
+    
+    Cached on the file contents, so repeated start commands for the same
+    mission skip the JSON parse; an edited file decodes afresh. Metadata is
+    cached re-encoded as bytes, so nothing a caller can mutate is shared.
+    """
+    data = orjson.loads(raw)
+    default_altitude = data.get("default_altitude", DEFAULT_ALTITUDE)
+    
+    waypoints = tuple(
+        (
+            wp_data["lat"],
+            wp_data["lon"],
+            wp_data.get("alt", default_altitude),
+            wp_data.get("hold_seconds", 0.0),
+            wp_data.get("action", "none"),
+            orjson.dumps(wp_data.get("metadata", {}))
+        )
+        for wp_data in data.get("waypoints", [])
+    )
+    fields = (
+        data["mission_id"],
+        data.get("name", "Unnamed Mission"),
+        orjson.dumps(data.get("payload_metadata", {})),
+        data.get("max_speed", DEFAULT_SPEED),
+        default_altitude
+    )
+    return fields, waypoints
+
+
+def _parse_mission(raw: bytes) -> Mission:
+    """Build a fresh Mission from mission JSON bytes (see _decode_mission())."""
+    (mission_id, name, payload_metadata, max_speed, default_altitude), waypoints = _decode_mission(raw)
+    
+    return Mission(
+        mission_id=mission_id,
+        name=name,
+        waypoints=[
+            Waypoint(
+                lat=lat,
+                lon=lon,
+                alt=alt,
+                hold_seconds=hold_seconds,
+                action=action,
+                metadata=orjson.loads(metadata)
+            )
+            for lat, lon, alt, hold_seconds, action, metadata in waypoints
+        ],
+        payload_metadata=orjson.loads(payload_metadata),
+        max_speed=max_speed,
+        default_altitude=default_altitude
+    )
+
+
 class GracefulKiller:
     """Handle graceful shutdown on SIGINT/SIGTERM."""
     
@@ -168,8 +238,19 @@ class MissionRunner:
         # MQTT client
         self.mqtt_client: Optional[mqtt.Client] = None
         
+        # Telemetry mission section and the fields it was built from
+        self._mission_fields = _IDLE_MISSION_FIELDS
+        self._mission_sub: Dict[str, Any] = _IDLE_MISSION_SECTION
+        
         # State machine
         self.state = MissionState.IDLE
+        self._state_handlers = {
+            MissionState.TAKEOFF: self._update_takeoff,
+            MissionState.ENROUTE: self._update_enroute,
+            MissionState.HOLD: self._update_hold,
+            MissionState.DELIVERY: self._update_delivery,
+            MissionState.RETURN: self._update_return,
+        }
         
     def setup_logging(self, log_level: str) -> None:
         """Configure logging with rotating file handler."""
@@ -241,7 +322,7 @@ class MissionRunner:
     def _on_mqtt_message(self, client: mqtt.Client, userdata: Any, msg: mqtt.MQTTMessage) -> None:  # noqa: ARG002
         """Handle incoming MQTT messages."""
         try:
-            data = json.loads(msg.payload.decode("utf-8"))
+            data = orjson.loads(msg.payload)
             
             if msg.topic == MISSION_COMMAND_TOPIC:
                 self._handle_mission_command(data)
@@ -259,7 +340,7 @@ class MissionRunner:
             mission_id = command.get("mission_id")
             if mission_id:
                 self._load_and_start_mission(mission_id)
-        elif cmd_type == "pause" and self.state in [MissionState.ENROUTE, MissionState.HOLD]:
+        elif cmd_type == "pause" and self.state in _PAUSEABLE_STATES:
             self._pause_mission()
         elif cmd_type == "resume" and self.state == MissionState.PAUSED:
             self._resume_mission()
@@ -270,7 +351,7 @@ class MissionRunner:
     
     def _handle_obstacle_detection(self, obstacle: Dict[str, Any]) -> None:
         """Handle obstacle detection events."""
-        if self.state not in [MissionState.ENROUTE, MissionState.HOLD]:
+        if self.state not in _PAUSEABLE_STATES:
             return
         
         obstacle_type = obstacle.get("type", "unknown")
@@ -290,31 +371,8 @@ class MissionRunner:
     def load_mission(self, mission_path: Path) -> Mission:
         """Load mission from JSON file."""
         try:
-            with mission_path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            
-            waypoints = []
-            for wp_data in data.get("waypoints", []):
-                waypoint = Waypoint(
-                    lat=wp_data["lat"],
-                    lon=wp_data["lon"],
-                    alt=wp_data.get("alt", data.get("default_altitude", DEFAULT_ALTITUDE)),
-                    hold_seconds=wp_data.get("hold_seconds", 0.0),
-                    action=wp_data.get("action", "none"),
-                    metadata=wp_data.get("metadata", {})
-                )
-                waypoints.append(waypoint)
-            
-            mission = Mission(
-                mission_id=data["mission_id"],
-                name=data.get("name", "Unnamed Mission"),
-                waypoints=waypoints,
-                payload_metadata=data.get("payload_metadata", {}),
-                max_speed=data.get("max_speed", DEFAULT_SPEED),
-                default_altitude=data.get("default_altitude", DEFAULT_ALTITUDE)
-            )
-            
-            logging.info("Loaded mission: %s (%d waypoints)", mission.name, len(waypoints))
+            mission = _parse_mission(mission_path.read_bytes())
+            logging.info("Loaded mission: %s (%d waypoints)", mission.name, len(mission.waypoints))
             return mission
             
         except Exception as exc:
@@ -335,7 +393,7 @@ class MissionRunner:
         except Exception as exc:
             logging.error("Failed to start mission %s: %s", mission_id, exc)
             self.state = MissionState.ERROR
-            self.mission_status.error_message = str(exc)
+            self._set_error_message(str(exc))
     
     def _start_mission(self) -> None:
         """Start mission execution."""
@@ -358,7 +416,7 @@ class MissionRunner:
     
     def _pause_mission(self) -> None:
         """Pause mission execution."""
-        if self.state in [MissionState.ENROUTE, MissionState.HOLD]:
+        if self.state in _PAUSEABLE_STATES:
             self.state = MissionState.PAUSED
             logging.info("Mission paused")
             self._publish_mission_status()
@@ -386,10 +444,21 @@ class MissionRunner:
     def _abort_mission(self) -> None:
         """Abort mission execution."""
         self.state = MissionState.ERROR
-        self.mission_status.error_message = "Mission aborted by command"
+        self._set_error_message("Mission aborted by command")
         logging.warning("Mission aborted")
         self._publish_mission_status()
     
+    def _set_error_message(self, message: str) -> None:
+        """Record ``message`` on the mission status, building it if needed.
+        
+        The status is otherwise only built when published, so without an
+        MQTT client (or before the first publish) it may not exist yet.
+        """
+        if self.mission_status is None and self.current_mission:
+            self._build_mission_status()
+        if self.mission_status is not None:
+            self.mission_status.error_message = message
+    
     def _calculate_distance(self, pos1: Tuple[float, float, float], pos2: Tuple[float, float, float]) -> float:
         """Calculate distance between two positions in meters (simplified)."""
         # Simplified distance calculation (not accounting for Earth's curvature)
@@ -398,7 +467,7 @@ class MissionRunner:
         
         # Convert to meters (rough approximation)
         lat_diff = (lat2 - lat1) * 111320  # meters per degree latitude
-        lon_diff = (lon2 - lon1) * 111320 * abs(lat1)  # meters per degree longitude (varies with latitude)
+        lon_diff = (lon2 - lon1) * 111320 * math.cos(math.radians(lat1))  # meters per degree longitude (shrinks with latitude)
         alt_diff = alt2 - alt1
         
         return (lat_diff**2 + lon_diff**2 + alt_diff**2)**0.5
@@ -416,71 +485,77 @@ class MissionRunner:
         if not self.current_mission or self.current_waypoint_index >= len(self.current_mission.waypoints):
             return
         
+        handler = self._state_handlers.get(self.state)
+        if handler is None:
+            return
+        
         current_wp = self.current_mission.waypoints[self.current_waypoint_index]
+        handler(current_wp, time.time())
+    
+    def _update_takeoff(self, current_wp: Waypoint, now: float) -> None:
+        """Climb to the first waypoint altitude."""
         target_pos = (current_wp.lat, current_wp.lon, current_wp.alt)
-        
-        if self.state == MissionState.TAKEOFF:
-            # Move to first waypoint altitude
-            self.target_position = target_pos
-            distance = self._calculate_distance(self.current_position, target_pos)
-            if distance < 1.0:  # Within 1 meter
-                self.state = MissionState.ENROUTE
-                self.waypoint_start_time = time.time()
-            else:
-                # Interpolate position
-                elapsed = time.time() - self.mission_start_time
-                total_time = distance / self.speed
-                progress = min(1.0, elapsed / total_time)
-                self.current_position = self._interpolate_position(
-                    (self.current_position[0], self.current_position[1], 0.0),
-                    target_pos, progress
-                )
-        
-        elif self.state == MissionState.ENROUTE:
-            # Move to current waypoint
-            distance = self._calculate_distance(self.current_position, target_pos)
-            if distance < 1.0:  # Within 1 meter
-                # Reached waypoint
-                self.current_position = target_pos
-                if current_wp.hold_seconds > 0:
-                    self.state = MissionState.HOLD
-                    self.hold_start_time = time.time()
-                else:
-                    self._advance_to_next_waypoint()
+        self.target_position = target_pos
+        distance = self._calculate_distance(self.current_position, target_pos)
+        if distance < 1.0:  # Within 1 meter
+            self.state = MissionState.ENROUTE
+            self.waypoint_start_time = now
+        else:
+            # Interpolate position
+            elapsed = now - self.mission_start_time
+            total_time = distance / self.speed
+            progress = min(1.0, elapsed / total_time)
+            self.current_position = self._interpolate_position(
+                (self.current_position[0], self.current_position[1], 0.0),
+                target_pos, progress
+            )
+    
+    def _update_enroute(self, current_wp: Waypoint, now: float) -> None:
+        """Move towards the current waypoint."""
+        target_pos = (current_wp.lat, current_wp.lon, current_wp.alt)
+        distance = self._calculate_distance(self.current_position, target_pos)
+        if distance < 1.0:  # Within 1 meter
+            # Reached waypoint
+            self.current_position = target_pos
+            if current_wp.hold_seconds > 0:
+                self.state = MissionState.HOLD
+                self.hold_start_time = now
             else:
-                # Interpolate position
-                elapsed = time.time() - self.waypoint_start_time
-                total_time = distance / self.speed
-                progress = min(1.0, elapsed / total_time)
-                self.current_position = self._interpolate_position(
-                    self.current_position, target_pos, progress
-                )
-        
-        elif self.state == MissionState.HOLD:
-            # Hold at current waypoint
-            elapsed = time.time() - self.hold_start_time
-            if elapsed >= current_wp.hold_seconds:
                 self._advance_to_next_waypoint()
-        
-        elif self.state == MissionState.DELIVERY:
-            # Execute delivery action
-            self._execute_delivery_action(current_wp)
+        else:
+            # Interpolate position
+            elapsed = now - self.waypoint_start_time
+            total_time = distance / self.speed
+            progress = min(1.0, elapsed / total_time)
+            self.current_position = self._interpolate_position(
+                self.current_position, target_pos, progress
+            )
+    
+    def _update_hold(self, current_wp: Waypoint, now: float) -> None:
+        """Hold at the current waypoint until its hold time elapses."""
+        elapsed = now - self.hold_start_time
+        if elapsed >= current_wp.hold_seconds:
             self._advance_to_next_waypoint()
-        
-        elif self.state == MissionState.RETURN:
-            # Return to start position
-            start_pos = (self.current_mission.waypoints[0].lat, 
-                        self.current_mission.waypoints[0].lon, 0.0)
-            distance = self._calculate_distance(self.current_position, start_pos)
-            if distance < 1.0:
-                self.state = MissionState.LANDED
-            else:
-                elapsed = time.time() - self.waypoint_start_time
-                total_time = distance / self.speed
-                progress = min(1.0, elapsed / total_time)
-                self.current_position = self._interpolate_position(
-                    self.current_position, start_pos, progress
-                )
+    
+    def _update_delivery(self, current_wp: Waypoint, now: float) -> None:  # noqa: ARG002
+        """Execute the delivery action and move on."""
+        self._execute_delivery_action(current_wp)
+        self._advance_to_next_waypoint()
+    
+    def _update_return(self, current_wp: Waypoint, now: float) -> None:  # noqa: ARG002
+        """Return to the start position."""
+        start_pos = (self.current_mission.waypoints[0].lat, 
+                    self.current_mission.waypoints[0].lon, 0.0)
+        distance = self._calculate_distance(self.current_position, start_pos)
+        if distance < 1.0:
+            self.state = MissionState.LANDED
+        else:
+            elapsed = now - self.waypoint_start_time
+            total_time = distance / self.speed
+            progress = min(1.0, elapsed / total_time)
+            self.current_position = self._interpolate_position(
+                self.current_position, start_pos, progress
+            )
     
     def _advance_to_next_waypoint(self) -> None:
         """Advance to the next waypoint in the mission."""
@@ -535,18 +610,15 @@ class MissionRunner:
             return
         
         try:
-            payload = json.dumps(command).encode("utf-8")
+            payload = orjson.dumps(command)
             result = self.mqtt_client.publish(SERVO_COMMAND_TOPIC, payload=payload, qos=1)
             result.wait_for_publish(2.0)
             logging.debug("Published servo command")
         except Exception as exc:
             logging.error("Failed to publish servo command: %s", exc)
     
-    def _publish_mission_status(self) -> None:
-        """Publish current mission status to MQTT."""
-        if not self.mqtt_client or not self.current_mission:
-            return
-        
+    def _build_mission_status(self) -> Dict[str, Any]:
+        """Refresh ``self.mission_status`` and return it as a dict."""
         # Calculate progress
         total_waypoints = len(self.current_mission.waypoints)
         progress = (self.current_waypoint_index / total_waypoints) * 100 if total_waypoints > 0 else 0
@@ -572,21 +644,41 @@ class MissionRunner:
             timestamp=time.time(),
             error_message=getattr(self.mission_status, 'error_message', None) if self.mission_status else None
         )
+        return asdict(self.mission_status)
+    
+    def _publish_mission_status(self) -> None:
+        """Publish current mission status to MQTT."""
+        if not self.mqtt_client or not self.current_mission:
+            return
+        
+        status = self._build_mission_status()
         
         try:
-            payload = json.dumps(asdict(self.mission_status), default=str).encode("utf-8")
+            payload = orjson.dumps(status)
             result = self.mqtt_client.publish(MISSION_STATUS_TOPIC, payload=payload, qos=1)
             result.wait_for_publish(2.0)
-            logging.debug("Published mission status: %s (%.1f%%)", self.state.value, progress)
+            logging.debug("Published mission status: %s (%.1f%%)", self.state.value, status["progress_percent"])
         except Exception as exc:
             logging.error("Failed to publish mission status: %s", exc)
     
-    def _publish_simulated_telemetry(self) -> None:
-        """Publish simulated telemetry data."""
-        if not self.mqtt_client:
-            return
+    def _build_simulated_telemetry(self) -> Dict[str, Any]:
+        """Build a simulated telemetry packet from the current mission state."""
+        # A new mission section only when its fields change; earlier packets
+        # keep the section they were built with
+        fields = (
+            self.current_mission.mission_id if self.current_mission else None,
+            self.state.value,
+            self.current_waypoint_index,
+            self.mission_status.progress_percent if self.mission_status else 0,
+        )
+        if fields != self._mission_fields:
+            self._mission_fields = fields
+            self._mission_sub = (
+                _IDLE_MISSION_SECTION if fields == _IDLE_MISSION_FIELDS
+                else dict(zip(_MISSION_SECTION_KEYS, fields))
+            )
         
-        telemetry = {
+        return {
             "device_id": DEVICE_ID,
             "timestamp": time.time(),
             "timestamp_iso": time.strftime("%Y-%m-%dT%H:%M:%S.%fZ", time.gmtime()),
@@ -614,23 +706,52 @@ class MissionRunner:
                 "accel": {"x_g": 0.0, "y_g": 0.0, "z_g": 1.0},
                 "gyro": {"x_dps": 0.0, "y_dps": 0.0, "z_dps": 0.0}
             },
-            "mission": {
-                "mission_id": self.current_mission.mission_id if self.current_mission else None,
-                "state": self.state.value,
-                "waypoint": self.current_waypoint_index,
-                "progress_percent": getattr(self.mission_status, 'progress_percent', 0) if self.mission_status else 0
-            }
+            "mission": self._mission_sub
         }
+    
+    def _publish_simulated_telemetry(self) -> None:
+        """Publish simulated telemetry data."""
+        if not self.mqtt_client:
+            return
+        
+        telemetry = self._build_simulated_telemetry()
         
         try:
-            payload = json.dumps(telemetry).encode("utf-8")
+            payload = orjson.dumps(telemetry)
             result = self.mqtt_client.publish(TELEMETRY_TOPIC, payload=payload, qos=1)
             result.wait_for_publish(2.0)
         except Exception as exc:
             logging.error("Failed to publish simulated telemetry: %s", exc)
     
-    def connect_mqtt_with_retries(self, retries: int = 10, backoff: float = 1.5) -> None:
-        """Connect to MQTT broker with retry logic."""
+    def _publish_status_and_telemetry(self) -> None:
+        """Publish mission status and telemetry together when both are due.
+        
+        Each still goes out on its own topic; the two QoS 1 publishes are
+        queued back to back and their PUBACKs awaited together, so the tick
+        waits for one broker round trip instead of two.
+        """
+        if not self.mqtt_client or not self.current_mission:
+            return
+        
+        try:
+            # Status first so the telemetry mission sub-dict sees its progress
+            status = self._build_mission_status()
+            status_result = self.mqtt_client.publish(MISSION_STATUS_TOPIC, payload=orjson.dumps(status), qos=1)
+            telemetry = self._build_simulated_telemetry()
+            telemetry_result = self.mqtt_client.publish(TELEMETRY_TOPIC, payload=orjson.dumps(telemetry), qos=1)
+            status_result.wait_for_publish(2.0)
+            telemetry_result.wait_for_publish(2.0)
+            logging.debug("Published mission status and telemetry: %s", self.state.value)
+        except Exception as exc:
+            logging.error("Failed to publish mission status and telemetry: %s", exc)
+    
+    def connect_mqtt_with_retries(self, retries: int = 10, base_delay: float = 0.1, max_delay: float = 10.0) -> None:
+        """Connect to MQTT broker with retry logic.
+        
+        Retries back off from ``base_delay``, doubling each attempt up to
+        ``max_delay``, with +/-20% jitter so several services don't hammer a
+        restarting broker in lockstep.
+        """
         attempt = 0
         while not self.killer.should_stop:
             try:
@@ -642,7 +763,9 @@ class MissionRunner:
                 if attempt > retries:
                     logging.error("Failed to connect to MQTT after %d attempts", retries)
                     raise
-                delay = min(10.0, backoff ** attempt)
+                # Shift is clamped so the doubling never grows unbounded
+                delay = min(max_delay, base_delay * (1 << min(attempt - 1, 16)))
+                delay *= random.uniform(0.8, 1.2)
                 logging.warning("MQTT connect failed (%s). Retry %d/%d in %.1fs", 
                               exc, attempt, retries, delay)
                 time.sleep(delay)
@@ -676,15 +799,22 @@ class MissionRunner:
                 if self.current_mission and self.state != MissionState.IDLE:
                     self._update_position()
                 
-                # Publish status every 2 seconds
-                if now - last_status_publish >= 2.0:
-                    if self.current_mission:
+                # Status every 2 seconds, telemetry every 1 second; when both
+                # are due on the same tick, publish them together
+                status_due = now - last_status_publish >= 2.0
+                telemetry_due = now - last_telemetry_publish >= 1.0
+                
+                if status_due and telemetry_due and self.current_mission:
+                    self._publish_status_and_telemetry()
+                else:
+                    if status_due and self.current_mission:
                         self._publish_mission_status()
-                    last_status_publish = now
+                    if telemetry_due:
+                        self._publish_simulated_telemetry()
                 
-                # Publish telemetry every 1 second
-                if now - last_telemetry_publish >= 1.0:
-                    self._publish_simulated_telemetry()
+                if status_due:
+                    last_status_publish = now
+                if telemetry_due:
                     last_telemetry_publish = now
                 
                 # Log state changes
@@ -4,7 +4,7 @@ GPS reader for Raspberry Pi using NEO-6M (UART on /dev/serial0).
 
 Features:
 - Opens /dev/serial0 at 9600 baud
-- Parses NMEA with pynmea2 (GGA/RMC)
+- Parses NMEA GGA/RMC sentences (checksum-validated)
 - Writes latest fix JSON to /home/pi/drone/telemetry/gps_latest.json
 - Publishes to MQTT topic: drone/<DEVICE_ID>/gps (QoS 1)
 - Retries serial and MQTT connections with backoff
@@ -18,16 +18,15 @@ Wiring (NEO-6M → Raspberry Pi):
 Ensure serial login shell is disabled and serial hardware is enabled in raspi-config.
 """
 
-import json
 import logging
 import os
 import signal
 import sys
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-import pynmea2  # type: ignore
+import orjson
 import serial  # type: ignore
 import paho.mqtt.client as mqtt  # type: ignore
 
@@ -46,7 +45,7 @@ MQTT_TOPIC = f"drone/{DEVICE_ID}/gps"
 
 OUTPUT_JSON_PATH = Path(os.getenv("GPS_OUTPUT_PATH", "/home/pi/drone/telemetry/gps_latest.json"))
 OUTPUT_JSON_PATH.parent.mkdir(parents=True, exist_ok=True)
-
+OUTPUT_TMP_PATH = str(OUTPUT_JSON_PATH) + ".tmp"
 
 def setup_logger() -> None:
     logging.basicConfig(
@@ -105,8 +104,13 @@ def connect_mqtt_with_retries(client: mqtt.Client, retries: int = 10, backoff: f
             time.sleep(delay)
 
 
-def build_mqtt_client() -> mqtt.Client:
-    client = mqtt.Client(client_id=f"gps-{DEVICE_ID}")
+def build_mqtt_client(client_id: Optional[str] = None) -> mqtt.Client:
+    client = mqtt.Client(client_id=client_id or f"gps-{DEVICE_ID}")
+    # Allow many unacked QoS 1 publishes in flight (paho defaults to 20) and
+    # bound the offline queue; the network loop thread retries reconnects
+    client.max_inflight_messages_set(100)
+    client.max_queued_messages_set(10000)
+    client.reconnect_delay_set(min_delay=1, max_delay=30)
     if MQTT_USERNAME:
         client.username_pw_set(MQTT_USERNAME, MQTT_PASSWORD)
     if MQTT_TLS_ENABLED:
@@ -117,100 +121,173 @@ def build_mqtt_client() -> mqtt.Client:
     return client
 
 
-def parse_nmea_to_fix(nmea: str) -> Optional[Dict[str, Any]]:
+def _nmea_checksum_ok(body: str, checksum: str) -> bool:
+    """Validate the XOR checksum of the characters between '$' and '*'."""
+    calc = 0
+    for ch in body.encode("ascii", "ignore"):
+        calc ^= ch
     try:
-        msg = pynmea2.parse(nmea)
-    except Exception:
+        return calc == int(checksum, 16)
+    except ValueError:
+        return False
+
+
+def _nmea_coord(value: str, hemi: str) -> Optional[float]:
+    """Convert NMEA ``[d]ddmm.mmmm`` + hemisphere to signed decimal degrees."""
+    if not value:
+        return None
+    dot = value.find(".")
+    split = (dot if dot >= 0 else len(value)) - 2
+    degrees = int(value[:split]) + float(value[split:]) / 60.0
+    return -degrees if hemi in ("S", "W") else degrees
+
+
+def _nmea_time(value: str) -> Optional[str]:
+    """Convert NMEA ``hhmmss[.ss]`` to an ISO time string."""
+    if len(value) < 6:
         return None
+    iso = f"{value[0:2]}:{value[2:4]}:{value[4:6]}"
+    if len(value) > 7:
+        micros = int(round(float(value[6:]) * 1_000_000))
+        if micros:
+            iso += f".{micros:06d}"
+    return iso
 
-    fix: Dict[str, Any] = {
+
+def _nmea_date(value: str) -> Optional[str]:
+    """Convert NMEA ``ddmmyy`` to an ISO date string."""
+    if len(value) != 6:
+        return None
+    century = "19" if value[4:6] >= "69" else "20"  # Same pivot as strptime's %y
+    return f"{century}{value[4:6]}-{value[2:4]}-{value[0:2]}"
+
+
+def _parse_gga(fields: List[str]) -> Optional[Dict[str, Any]]:
+    # $xxGGA,time,lat,N/S,lon,E/W,quality,num_sats,hdop,alt,M,...
+    if len(fields) < 10:
+        return None
+    _, utc, lat, ns, lon, ew, qual, sats, hdop, alt = fields[:10]
+    return {
         "device_id": DEVICE_ID,
         "raw": None,
+        "type": "GGA",
+        "timestamp": _nmea_time(utc),
+        "lat": _nmea_coord(lat, ns),
+        "lon": _nmea_coord(lon, ew),
+        "alt": float(alt) if alt else None,
+        "num_sats": int(sats) if sats else None,
+        "hdop": float(hdop) if hdop else None,
+        "quality": int(qual) if qual else None,
     }
 
-    if isinstance(msg, pynmea2.types.talker.GGA):
-        # GPS fix data
-        fix.update(
-            {
-                "type": "GGA",
-                "timestamp": getattr(msg, "timestamp", None).isoformat() if getattr(msg, "timestamp", None) else None,
-                "lat": msg.latitude if hasattr(msg, "latitude") else None,
-                "lon": msg.longitude if hasattr(msg, "longitude") else None,
-                "alt": float(msg.altitude) if getattr(msg, "altitude", None) else None,
-                "num_sats": int(msg.num_sats) if getattr(msg, "num_sats", None) else None,
-                "hdop": float(msg.horizontal_dil) if getattr(msg, "horizontal_dil", None) else None,
-                "quality": int(msg.gps_qual) if getattr(msg, "gps_qual", None) else None,
-            }
-        )
-        return fix
-    if isinstance(msg, pynmea2.types.talker.RMC):
-        fix.update(
-            {
-                "type": "RMC",
-                "timestamp": getattr(msg, "datestamp", None).isoformat() + "T" + getattr(msg, "timestamp", None).isoformat()
-                if getattr(msg, "datestamp", None) and getattr(msg, "timestamp", None)
-                else None,
-                "lat": msg.latitude if hasattr(msg, "latitude") else None,
-                "lon": msg.longitude if hasattr(msg, "longitude") else None,
-                "spd_over_grnd": float(msg.spd_over_grnd) if getattr(msg, "spd_over_grnd", None) else None,
-                "true_course": float(msg.true_course) if getattr(msg, "true_course", None) else None,
-                "status": getattr(msg, "status", None),
-            }
-        )
-        return fix
-    return None
+
+def _parse_rmc(fields: List[str]) -> Optional[Dict[str, Any]]:
+    # $xxRMC,time,status,lat,N/S,lon,E/W,speed,course,date,...
+    if len(fields) < 10:
+        return None
+    _, utc, status, lat, ns, lon, ew, speed, course, date = fields[:10]
+    time_iso = _nmea_time(utc)
+    date_iso = _nmea_date(date)
+    return {
+        "device_id": DEVICE_ID,
+        "raw": None,
+        "type": "RMC",
+        "timestamp": date_iso + "T" + time_iso if date_iso and time_iso else None,
+        "lat": _nmea_coord(lat, ns),
+        "lon": _nmea_coord(lon, ew),
+        "spd_over_grnd": float(speed) if speed else None,
+        "true_course": float(course) if course else None,
+        "status": status or None,
+    }
+
+
+# NMEA sentence types turned into fixes; everything else is dropped early
+_SENTENCE_PARSERS: Dict[str, Callable[[List[str]], Optional[Dict[str, Any]]]] = {
+    "GGA": _parse_gga,
+    "RMC": _parse_rmc,
+}
+
+
+def parse_nmea_to_fix(nmea: str) -> Optional[Dict[str, Any]]:
+    """Parse a GGA or RMC sentence into a fix dict; other sentences return None.
+
+    Only the fixed field positions we publish are extracted, which avoids the
+    generic sentence/class machinery of a full NMEA library on every line.
+    """
+    # "$ttSSS,..." - identify the sentence from its fixed position first so
+    # the GSV/GSA/VTG traffic we ignore skips checksum and splitting entirely
+    parser = _SENTENCE_PARSERS.get(nmea[3:6])
+    if parser is None or not nmea.startswith("$"):
+        return None
+    body, sep, checksum = nmea[1:].partition("*")
+    if sep and not _nmea_checksum_ok(body, checksum.strip()):
+        return None
+
+    try:
+        return parser(body.split(","))
+    except ValueError:
+        return None
 
 
 def write_latest_fix_json(fix: Dict[str, Any]) -> None:
+    # Write to a sibling temp file and rename over the target so readers
+    # never see a half-written file
     try:
-        with OUTPUT_JSON_PATH.open("w", encoding="utf-8") as f:
-            json.dump(fix, f, ensure_ascii=False, indent=2)
+        fd = os.open(OUTPUT_TMP_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, orjson.dumps(fix))
+        finally:
+            os.close(fd)
+        os.replace(OUTPUT_TMP_PATH, OUTPUT_JSON_PATH)
     except Exception:  # noqa: BLE001
         logging.exception("Failed to write %s", OUTPUT_JSON_PATH)
 
 
 def publish_mqtt_fix(client: mqtt.Client, fix: Dict[str, Any]) -> None:
+    # Enqueue only: the loop_start() network thread delivers it, so a slow
+    # broker never stalls draining the serial port
     try:
-        payload = json.dumps(fix).encode("utf-8")
-        result = client.publish(MQTT_TOPIC, payload=payload, qos=1)
-        result.wait_for_publish(2.0)
+        payload = orjson.dumps(fix)
+        client.publish(MQTT_TOPIC, payload=payload, qos=1)
     except Exception:  # noqa: BLE001
         logging.exception("Failed to publish MQTT message")
 
 
-def main() -> None:
-    setup_logger()
-    logging.info("Starting gps_reader (device_id=%s, port=%s)", DEVICE_ID, SERIAL_PORT)
-    killer = GracefulKiller()
-
-    mqtt_client = build_mqtt_client()
-    connect_mqtt_with_retries(mqtt_client)
+def run(killer: GracefulKiller, mqtt_client: mqtt.Client) -> None:
+    """Read NMEA from the serial port and publish fixes until ``killer`` fires.
 
+    ``mqtt_client`` must already be connected with its network loop running;
+    it may be shared with other readers (see ``sensors/main.py``).
+    """
     ser = connect_serial_with_retries(SERIAL_PORT, SERIAL_BAUD)
 
-    # Read loop
-    buffer = b""
+    # Read loop: NMEA is line-framed, so let pyserial drain up to each newline
+    partial = b""
     last_publish_ts = 0.0
     while not killer.should_stop:
         try:
-            chunk = ser.read(128)
-            if not chunk:
+            line = ser.readline()
+            if not line:
+                continue
+            if not line.endswith(b"\n"):
+                # Read timed out mid-sentence; keep it for the next call
+                partial += line
+                continue
+            if partial:
+                line = partial + line
+                partial = b""
+            nmea_str = line.decode(errors="ignore").strip()
+            if not nmea_str:
                 continue
-            buffer += chunk
-            while b"\n" in buffer:
-                line, buffer = buffer.split(b"\n", 1)
-                nmea_str = line.decode(errors="ignore").strip()
-                if not nmea_str:
-                    continue
-                fix = parse_nmea_to_fix(nmea_str)
-                if not fix:
-                    continue
-                now = time.time()
-                # Limit writes/publishes to ~1 Hz
-                if now - last_publish_ts >= 1.0:
-                    write_latest_fix_json(fix)
-                    publish_mqtt_fix(mqtt_client, fix)
-                    last_publish_ts = now
+            fix = parse_nmea_to_fix(nmea_str)
+            if not fix:
+                continue
+            now = time.time()
+            # Limit writes/publishes to ~1 Hz
+            if now - last_publish_ts >= 1.0:
+                write_latest_fix_json(fix)
+                publish_mqtt_fix(mqtt_client, fix)
+                last_publish_ts = now
         except Exception:
             logging.exception("Error in read loop; continuing")
             time.sleep(0.5)
@@ -219,7 +296,21 @@ def main() -> None:
         ser.close()
     except Exception:  # noqa: BLE001
         pass
+
+
+def main() -> None:
+    setup_logger()
+    logging.info("Starting gps_reader (device_id=%s, port=%s)", DEVICE_ID, SERIAL_PORT)
+    killer = GracefulKiller()
+
+    mqtt_client = build_mqtt_client()
+    connect_mqtt_with_retries(mqtt_client)
+    mqtt_client.loop_start()
+
+    run(killer, mqtt_client)
+
     try:
+        mqtt_client.loop_stop()
         mqtt_client.disconnect()
     except Exception:  # noqa: BLE001
         pass
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Combined sensor runner: GPS and IMU readers in one process.
+
+Features:
+- Runs gps_reader.run() and imu_reader.run() in worker threads
+- Shares a single MQTT client (one TCP/TLS session, one network loop thread)
+- Graceful shutdown on SIGINT/SIGTERM stops both readers
+
+Usage (instead of starting gps_reader.py and imu_reader.py separately):
+    PYTHONPATH=src python -m sensors.main
+
+Both readers keep their own topics (drone/<DEVICE_ID>/gps, drone/<DEVICE_ID>/imu)
+and can still be run standalone.
+"""
+
+import logging
+import threading
+
+from sensors import gps_reader, imu_reader
+
+
+def main() -> None:
+    gps_reader.setup_logger()
+    logging.info("Starting sensors (device_id=%s)", gps_reader.DEVICE_ID)
+    killer = gps_reader.GracefulKiller()
+
+    mqtt_client = gps_reader.build_mqtt_client(client_id=f"sensors-{gps_reader.DEVICE_ID}")
+    gps_reader.connect_mqtt_with_retries(mqtt_client)
+    mqtt_client.loop_start()
+
+    # paho's publish() is thread-safe, so both readers enqueue on the same client
+    threads = [
+        threading.Thread(target=gps_reader.run, args=(killer, mqtt_client), name="gps", daemon=True),
+        threading.Thread(target=imu_reader.run, args=(killer, mqtt_client), name="imu", daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    try:
+        mqtt_client.loop_stop()
+        mqtt_client.disconnect()
+    except Exception:  # noqa: BLE001
+        pass
+    logging.info("sensors stopped")
+
+
+if __name__ == "__main__":
+    main()
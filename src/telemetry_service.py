@@ -22,17 +22,20 @@ Usage:
 """
 
 import argparse
-import json
 import logging
 import logging.handlers
 import os
+import queue
 import signal
+import socket
 import sys
+import threading
 import time
-from collections import deque
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import msgpack  # type: ignore
+import orjson
 import paho.mqtt.client as mqtt  # type: ignore
 
 
@@ -44,10 +47,14 @@ MQTT_USERNAME = os.getenv("MQTT_USERNAME", "")
 MQTT_PASSWORD = os.getenv("MQTT_PASSWORD", "")
 MQTT_TLS_ENABLED = os.getenv("MQTT_TLS_ENABLED", "false").lower() == "true"
 MQTT_CA_CERT = os.getenv("MQTT_CA_CERT", "/etc/ssl/certs/ca-certificates.crt")
+# Path of a broker Unix socket (Mosquitto: "listener 0 /run/mosquitto/mosquitto.sock");
+# when set, MQTT_HOST/MQTT_PORT and TLS are ignored
+MQTT_UNIX_SOCKET = os.getenv("MQTT_UNIX_SOCKET", "")
 
 # Topic configuration
 GPS_TOPIC = f"drone/{DEVICE_ID}/gps"
 IMU_TOPIC = f"drone/{DEVICE_ID}/imu"
+IMU_MSGPACK_TOPIC = f"drone/{DEVICE_ID}/imu/mpk"  # Same batches, MessagePack-encoded
 TELEMETRY_TOPIC = f"drone/{DEVICE_ID}/telemetry"
 
 # File paths
@@ -58,68 +65,154 @@ TELEMETRY_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
 TELEMETRY_INTERVAL = float(os.getenv("TELEMETRY_INTERVAL", "1.0"))  # seconds
 MAX_LOG_PACKETS = int(os.getenv("MAX_LOG_PACKETS", "500"))
 MAX_LOG_SIZE_MB = int(os.getenv("MAX_LOG_SIZE_MB", "10"))
+LOG_BUFFER_BYTES = 64 * 1024
+
+# Dry-run samples per replay cycle: the LCM of the simulated signal periods
+# (2..100 s), so the ring repeats seamlessly at the default 1 Hz tick
+SIM_RING_SIZE = 600
+
+# Simulated 3S LiPo discharge (0.1V per hour between full and empty)
+BATTERY_FULL_V = 12.6
+BATTERY_EMPTY_V = 10.5
+_BAT_SLOPE = 0.1 / 3600.0
+_BAT_PCT_SCALE = 100.0 / (BATTERY_FULL_V - BATTERY_EMPTY_V)
+
+# Static until real camera detection exists; shared by every packet
+_CAMERA_STATUS: Dict[str, Any] = {
+    "available": True,
+    "resolution": "1920x1080",
+    "fps": 30,
+    "recording": False
+}
+
+
+def expand_imu_sample(sample: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a flat imu_reader sample into the nested accel/gyro/est form."""
+    return {
+        "ts": sample.get("ts"),
+        "accel": {"x_g": sample.get("ax"), "y_g": sample.get("ay"), "z_g": sample.get("az")},
+        "gyro": {"x_dps": sample.get("gx"), "y_dps": sample.get("gy"), "z_dps": sample.get("gz")},
+        "est": {"pitch_deg": sample.get("p"), "roll_deg": sample.get("r")},
+    }
+
+
+class UnixSocketMQTTClient(mqtt.Client):
+    """paho client that reaches a colocated broker over a Unix domain socket.
+    
+    Skips the loopback TCP stack for every packet. paho 1.6 has no "unix"
+    transport, so this swaps the socket paho opens on (re)connect.
+    """
+    
+    def __init__(self, socket_path: str, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._unix_socket_path = socket_path
+    
+    def _create_socket_connection(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self._connect_timeout)
+        try:
+            sock.connect(self._unix_socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
 
 
 class GracefulKiller:
     """Handle graceful shutdown on SIGINT/SIGTERM."""
     
     def __init__(self) -> None:
-        self._kill = False
+        self._event = threading.Event()
         signal.signal(signal.SIGINT, self._on_signal)
         signal.signal(signal.SIGTERM, self._on_signal)
 
     def _on_signal(self, signum: int, frame: Any) -> None:  # noqa: ARG002
         logging.info("Received signal %s, shutting down gracefully...", signum)
-        self._kill = True
+        self._event.set()
 
     @property
     def should_stop(self) -> bool:
-        return self._kill
+        return self._event.is_set()
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to ``timeout`` seconds, returning early (True) on shutdown."""
+        return self._event.wait(timeout)
 
 
 class RotatingLogWriter:
     """Handle rotating log files with size limits."""
     
-    def __init__(self, log_path: Path, max_packets: int, max_size_mb: int) -> None:
+    def __init__(self, log_path: Path, max_packets: int, max_size_mb: int, flush_every_n: int = 16) -> None:
         self.log_path = log_path
         self.max_packets = max_packets
         self.max_size_bytes = max_size_mb * 1024 * 1024
-        self.packet_buffer = deque(maxlen=max_packets)
+        self.flush_every_n = flush_every_n
+        self._backup_path = self.log_path.with_suffix(self.log_path.suffix + ".1")
+        # One long-lived buffered handle instead of open/write/close per packet
+        self._fh = self.log_path.open("ab", buffering=LOG_BUFFER_BYTES)
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
         
     def _should_rotate(self) -> bool:
         """Check if log file should be rotated based on size."""
-        if not self.log_path.exists():
-            return False
-        return self.log_path.stat().st_size > self.max_size_bytes
+        # tell() includes bytes still in the write buffer and needs no stat()
+        return self._fh.tell() > self.max_size_bytes
     
     def _rotate_log(self) -> None:
         """Rotate log file by moving current to .1 and creating new."""
-        if not self.log_path.exists():
-            return
-            
-        # Move current log to .1
-        backup_path = self.log_path.with_suffix(self.log_path.suffix + ".1")
-        if backup_path.exists():
-            backup_path.unlink()
-        self.log_path.rename(backup_path)
-        logging.info("Rotated log file to %s", backup_path)
-    
-    def write_packet(self, packet: Dict[str, Any]) -> None:
-        """Write telemetry packet to log with rotation handling."""
+        self._fh.close()
+        if self.log_path.exists():
+            # Move current log to .1 (rename replaces any previous backup)
+            self.log_path.replace(self._backup_path)
+            logging.info("Rotated log file to %s", self._backup_path)
+        self._fh = self.log_path.open("ab", buffering=LOG_BUFFER_BYTES)
+    
+    def write_packet(self, payload: bytes) -> None:
+        """Write a serialized telemetry packet to log with rotation handling."""
         try:
             # Check if rotation is needed
             if self._should_rotate():
                 self._rotate_log()
             
-            # Add to buffer
-            self.packet_buffer.append(packet)
-            
-            # Write to file
-            with self.log_path.open("a", encoding="utf-8") as f:
-                f.write(json.dumps(packet) + "\n")
+            # Write to file; flushed every N packets or once a second
+            self._fh.write(payload)
+            self._fh.write(b"\n")
+            self._unflushed += 1
+            self._maybe_flush()
                 
         except Exception as exc:
             logging.error("Failed to write telemetry packet: %s", exc)
+    
+    def write_packets(self, payloads: Iterable[bytes]) -> None:
+        """Write a batch of serialized packets with a single buffered write."""
+        try:
+            batch = list(payloads)
+            if not batch:
+                return
+            # Rotation is checked once per batch, like write_packet() per packet
+            if self._should_rotate():
+                self._rotate_log()
+            
+            self._fh.write(b"\n".join(batch) + b"\n")
+            self._unflushed += len(batch)
+            self._maybe_flush()
+            
+        except Exception as exc:
+            logging.error("Failed to write telemetry packets: %s", exc)
+    
+    def _maybe_flush(self) -> None:
+        now = time.monotonic()
+        if self._unflushed >= self.flush_every_n or now - self._last_flush > 1.0:
+            self._fh.flush()
+            self._unflushed = 0
+            self._last_flush = now
+    
+    def close(self) -> None:
+        """Flush and close the log file."""
+        try:
+            self._fh.close()
+        except Exception as exc:
+            logging.error("Failed to close telemetry log: %s", exc)
 
 
 class TelemetryAggregator:
@@ -133,17 +226,68 @@ class TelemetryAggregator:
         )
         
         # Latest sensor data
-        self.latest_gps: Optional[Dict[str, Any]] = None
-        self.latest_imu: Optional[Dict[str, Any]] = None
-        self.last_telemetry_time = 0.0
+        # Assigning these also builds the packet sections (see the setters)
+        self.latest_gps = None
+        self.latest_imu = None
         
         # MQTT client
         self.mqtt_client: Optional[mqtt.Client] = None
+        self._last_pub_info: Optional[mqtt.MQTTMessageInfo] = None
+        
+        # (whole second, "YYYY-MM-DDTHH:MM:SS") of the last formatted timestamp
+        self._iso_cache: Tuple[int, str] = (-1, "")
+        
+        # Background log writer, started by setup_logging()
+        self._log_listener: Optional[logging.handlers.QueueListener] = None
         
         # Battery estimation (simplified)
-        self.battery_voltage = 12.6  # Starting voltage for 3S LiPo
+        self.battery_voltage = BATTERY_FULL_V  # Starting voltage for 3S LiPo
         self.battery_percentage = 100.0
+        self._battery_start_time = time.monotonic()
+        
+        # Dry-run sample ring, built on first use
+        self._sim_ring: Optional[List[Tuple[Dict[str, Any], Dict[str, Any]]]] = None
+        self._sim_index = 0
         
+    @property
+    def latest_gps(self) -> Optional[Dict[str, Any]]:
+        return self._latest_gps
+    
+    @latest_gps.setter
+    def latest_gps(self, fix: Optional[Dict[str, Any]]) -> None:
+        # Repack once per incoming fix rather than on every telemetry tick;
+        # the section is swapped in with one assignment, so the paho thread
+        # never leaves a half-built dict for the main loop
+        self._latest_gps = fix
+        self._gps_section = {
+            "lat": fix.get("lat"),
+            "lon": fix.get("lon"),
+            "alt": fix.get("alt"),
+            "num_sats": fix.get("num_sats"),
+            "hdop": fix.get("hdop"),
+            "quality": fix.get("quality"),
+            "gps_timestamp": fix.get("timestamp")
+        } if fix else None
+    
+    @property
+    def latest_imu(self) -> Optional[Dict[str, Any]]:
+        return self._latest_imu
+    
+    @latest_imu.setter
+    def latest_imu(self, sample: Optional[Dict[str, Any]]) -> None:
+        self._latest_imu = sample
+        if sample:
+            est = sample.get("est") or {}
+            self._imu_section = {
+                "pitch_deg": est.get("pitch_deg"),
+                "roll_deg": est.get("roll_deg"),
+                "accel": sample.get("accel"),
+                "gyro": sample.get("gyro"),
+                "imu_timestamp": sample.get("ts")
+            }
+        else:
+            self._imu_section = None
+    
     def setup_logging(self, log_level: str) -> None:
         """Configure logging with rotating file handler."""
         level = getattr(logging, log_level.upper(), logging.INFO)
@@ -165,11 +309,19 @@ class TelemetryAggregator:
         )
         file_handler.setFormatter(formatter)
         
-        # Configure root logger
+        # Configure root logger: callers (incl. paho's network thread) only
+        # enqueue records; a listener thread does the console/file writes
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
         logging.basicConfig(
             level=level,
-            handlers=[console_handler, file_handler]
+            handlers=[queue_handler]
         )
+        if queue_handler in logging.getLogger().handlers:
+            self._log_listener = logging.handlers.QueueListener(
+                log_queue, console_handler, file_handler, respect_handler_level=True
+            )
+            self._log_listener.start()
         
         # Suppress paho-mqtt debug logs unless DEBUG level
         if level != logging.DEBUG:
@@ -177,12 +329,22 @@ class TelemetryAggregator:
     
     def build_mqtt_client(self) -> mqtt.Client:
         """Create and configure MQTT client."""
-        client = mqtt.Client(client_id=f"telemetry-{DEVICE_ID}")
+        # Persistent session: the broker keeps our subscriptions and queued
+        # QoS 1 sensor messages across reconnects
+        if MQTT_UNIX_SOCKET:
+            client = UnixSocketMQTTClient(MQTT_UNIX_SOCKET, client_id=f"telemetry-{DEVICE_ID}", clean_session=False)
+        else:
+            client = mqtt.Client(client_id=f"telemetry-{DEVICE_ID}", clean_session=False)
+        client.enable_logger(logging.getLogger("paho.mqtt"))
+        # Publishes are not awaited, so bound what paho buffers while offline
+        client.max_inflight_messages_set(100)
+        client.max_queued_messages_set(10000)
+        client.reconnect_delay_set(min_delay=1, max_delay=30)
         
         if MQTT_USERNAME:
             client.username_pw_set(MQTT_USERNAME, MQTT_PASSWORD)
             
-        if MQTT_TLS_ENABLED:
+        if MQTT_TLS_ENABLED and not MQTT_UNIX_SOCKET:
             try:
                 client.tls_set(ca_certs=MQTT_CA_CERT)
             except Exception as exc:
@@ -198,11 +360,12 @@ class TelemetryAggregator:
     def _on_mqtt_connect(self, client: mqtt.Client, userdata: Any, flags: Dict[str, Any], rc: int) -> None:  # noqa: ARG002
         """Handle MQTT connection."""
         if rc == 0:
-            logging.info("Connected to MQTT broker %s:%d", MQTT_HOST, MQTT_PORT)
+            logging.info("Connected to MQTT broker %s", MQTT_UNIX_SOCKET or f"{MQTT_HOST}:{MQTT_PORT}")
             # Subscribe to sensor topics
             client.subscribe(GPS_TOPIC, qos=1)
             client.subscribe(IMU_TOPIC, qos=1)
-            logging.info("Subscribed to topics: %s, %s", GPS_TOPIC, IMU_TOPIC)
+            client.subscribe(IMU_MSGPACK_TOPIC, qos=1)
+            logging.info("Subscribed to topics: %s, %s, %s", GPS_TOPIC, IMU_TOPIC, IMU_MSGPACK_TOPIC)
         else:
             logging.error("Failed to connect to MQTT broker: %s", mqtt.connack_string(rc))
     
@@ -216,12 +379,22 @@ class TelemetryAggregator:
     def _on_mqtt_message(self, client: mqtt.Client, userdata: Any, msg: mqtt.MQTTMessage) -> None:  # noqa: ARG002
         """Handle incoming MQTT messages."""
         try:
-            data = json.loads(msg.payload.decode("utf-8"))
+            if msg.topic == IMU_MSGPACK_TOPIC:
+                data = msgpack.unpackb(msg.payload)
+            else:
+                data = orjson.loads(msg.payload)
             
             if msg.topic == GPS_TOPIC:
                 self.latest_gps = data
                 logging.debug("Updated GPS data: %s", data.get("type", "unknown"))
-            elif msg.topic == IMU_TOPIC:
+            elif msg.topic == IMU_TOPIC or msg.topic == IMU_MSGPACK_TOPIC:
+                # imu_reader publishes batches; only the newest sample matters here
+                if "samples" in data:
+                    if not data["samples"]:
+                        return
+                    data = data["samples"][-1]
+                if "est" not in data:
+                    data = expand_imu_sample(data)
                 self.latest_imu = data
                 logging.debug("Updated IMU data: pitch=%.2f roll=%.2f", 
                             data.get("est", {}).get("pitch_deg", 0),
@@ -229,34 +402,40 @@ class TelemetryAggregator:
         except Exception as exc:
             logging.error("Failed to parse MQTT message from %s: %s", msg.topic, exc)
     
+    def _iso(self, now: float) -> str:
+        """Format an epoch time as ISO 8601 UTC with milliseconds.
+        
+        The date/time prefix is rebuilt only when the whole second changes.
+        """
+        sec = int(now)
+        cached_sec, prefix = self._iso_cache
+        if sec != cached_sec:
+            t = time.gmtime(sec)
+            prefix = (f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+                      f"T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}")
+            self._iso_cache = (sec, prefix)
+        return f"{prefix}.{int((now - sec) * 1000):03d}Z"
+    
     def estimate_battery(self) -> Tuple[float, float]:
         """Estimate battery voltage and percentage (simplified model)."""
         # Simple battery model - in real implementation, read from ADC
         # For now, simulate gradual discharge
-        current_time = time.time()
-        if not hasattr(self, '_battery_start_time'):
-            self._battery_start_time = current_time
-        
-        # Simulate 2-hour flight time
-        flight_time = current_time - self._battery_start_time
-        discharge_rate = 0.1 / 3600  # 0.1V per hour
-        self.battery_voltage = max(10.5, 12.6 - (flight_time * discharge_rate))
+        flight_time = time.monotonic() - self._battery_start_time
+        voltage = BATTERY_FULL_V - flight_time * _BAT_SLOPE
+        if voltage < BATTERY_EMPTY_V:
+            voltage = BATTERY_EMPTY_V
+        self.battery_voltage = voltage
         
         # Convert to percentage (10.5V = 0%, 12.6V = 100%)
-        self.battery_percentage = max(0, min(100, 
-            (self.battery_voltage - 10.5) / (12.6 - 10.5) * 100))
+        pct = (voltage - BATTERY_EMPTY_V) * _BAT_PCT_SCALE
+        self.battery_percentage = 100.0 if pct > 100.0 else pct
         
         return self.battery_voltage, self.battery_percentage
     
     def get_camera_status(self) -> Dict[str, Any]:
         """Get camera status (simplified)."""
         # In real implementation, check camera availability
-        return {
-            "available": True,
-            "resolution": "1920x1080",
-            "fps": 30,
-            "recording": False
-        }
+        return _CAMERA_STATUS
     
     def create_telemetry_packet(self) -> Dict[str, Any]:
         """Create unified telemetry packet from latest sensor data."""
@@ -266,110 +445,89 @@ class TelemetryAggregator:
         packet = {
             "device_id": DEVICE_ID,
             "timestamp": now,
-            "timestamp_iso": time.strftime("%Y-%m-%dT%H:%M:%S.%fZ", time.gmtime(now)),
+            "timestamp_iso": self._iso(now),
             "battery": {
                 "voltage": round(battery_voltage, 2),
                 "percentage": round(battery_percentage, 1)
             },
-            "camera": self.get_camera_status()
+            "camera": self.get_camera_status(),
+            # Prebuilt when sensor data arrives; None until the first message
+            "gps": self._gps_section,
+            "imu": self._imu_section
         }
         
-        # Add GPS data if available
-        if self.latest_gps:
-            gps_data = {
-                "lat": self.latest_gps.get("lat"),
-                "lon": self.latest_gps.get("lon"),
-                "alt": self.latest_gps.get("alt"),
-                "num_sats": self.latest_gps.get("num_sats"),
-                "hdop": self.latest_gps.get("hdop"),
-                "quality": self.latest_gps.get("quality"),
-                "gps_timestamp": self.latest_gps.get("timestamp")
-            }
-            packet["gps"] = gps_data
-        else:
-            packet["gps"] = None
-        
-        # Add IMU data if available
-        if self.latest_imu:
-            imu_data = {
-                "pitch_deg": self.latest_imu.get("est", {}).get("pitch_deg"),
-                "roll_deg": self.latest_imu.get("est", {}).get("roll_deg"),
-                "accel": self.latest_imu.get("accel"),
-                "gyro": self.latest_imu.get("gyro"),
-                "imu_timestamp": self.latest_imu.get("ts")
-            }
-            packet["imu"] = imu_data
-        else:
-            packet["imu"] = None
-        
         return packet
     
-    def publish_telemetry(self, packet: Dict[str, Any]) -> None:
-        """Publish telemetry packet to MQTT."""
+    def publish_telemetry(self, payload: bytes) -> None:
+        """Publish a serialized telemetry packet to MQTT."""
         if not self.mqtt_client:
             return
             
+        # Enqueue only: the loop_start() network thread delivers the QoS 1
+        # message, so a slow broker never stalls the aggregation loop
         try:
-            payload = json.dumps(packet).encode("utf-8")
-            result = self.mqtt_client.publish(TELEMETRY_TOPIC, payload=payload, qos=1)
-            result.wait_for_publish(2.0)
+            self._last_pub_info = self.mqtt_client.publish(TELEMETRY_TOPIC, payload=payload, qos=1)
             logging.debug("Published telemetry packet")
         except Exception as exc:
             logging.error("Failed to publish telemetry: %s", exc)
     
-    def simulate_sensor_data(self) -> None:
-        """Simulate sensor data for dry-run mode."""
-        now = time.time()
-        
-        # Simulate GPS data
-        self.latest_gps = {
+    def _build_simulated_sample(self, t: float) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Build one simulated (gps, imu) pair for time ``t``."""
+        gps = {
             "device_id": DEVICE_ID,
             "type": "GGA",
-            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S.%fZ", time.gmtime(now)),
-            "lat": 37.7749 + (now % 100) * 0.0001,  # Simulate movement
-            "lon": -122.4194 + (now % 100) * 0.0001,
-            "alt": 100.0 + (now % 10) * 2.0,
+            "timestamp": None,
+            "lat": 37.7749 + (t % 100) * 0.0001,  # Simulate movement
+            "lon": -122.4194 + (t % 100) * 0.0001,
+            "alt": 100.0 + (t % 10) * 2.0,
             "num_sats": 8,
             "hdop": 1.2,
             "quality": 1
         }
-        
-        # Simulate IMU data
-        self.latest_imu = {
-            "ts": now,
+        imu = {
+            "ts": t,
             "accel": {
-                "x_g": 0.1 + (now % 5) * 0.1,
-                "y_g": -0.2 + (now % 3) * 0.1,
-                "z_g": 1.0 + (now % 2) * 0.1
+                "x_g": 0.1 + (t % 5) * 0.1,
+                "y_g": -0.2 + (t % 3) * 0.1,
+                "z_g": 1.0 + (t % 2) * 0.1
             },
             "gyro": {
-                "x_dps": (now % 10) * 0.5,
-                "y_dps": (now % 8) * 0.3,
-                "z_dps": (now % 6) * 0.2
+                "x_dps": (t % 10) * 0.5,
+                "y_dps": (t % 8) * 0.3,
+                "z_dps": (t % 6) * 0.2
             },
             "est": {
-                "pitch_deg": (now % 20) * 0.5 - 5.0,
-                "roll_deg": (now % 15) * 0.3 - 2.0
+                "pitch_deg": (t % 20) * 0.5 - 5.0,
+                "roll_deg": (t % 15) * 0.3 - 2.0
             }
         }
+        return gps, imu
     
-    def connect_mqtt_with_retries(self, retries: int = 10, backoff: float = 1.5) -> None:
-        """Connect to MQTT broker with retry logic."""
-        attempt = 0
-        while not self.killer.should_stop:
-            try:
-                self.mqtt_client.connect(MQTT_HOST, MQTT_PORT, keepalive=30)
-                self.mqtt_client.loop_start()
-                return
-            except Exception as exc:
-                attempt += 1
-                if attempt > retries:
-                    logging.error("Failed to connect to MQTT after %d attempts", retries)
-                    raise
-                delay = min(10.0, backoff ** attempt)
-                logging.warning("MQTT connect failed (%s). Retry %d/%d in %.1fs", 
-                              exc, attempt, retries, delay)
-                time.sleep(delay)
+    def simulate_sensor_data(self) -> None:
+        """Simulate sensor data for dry-run mode."""
+        now = time.time()
+        if self._sim_ring is None:
+            # Precompute one full cycle of the simulated signals, then replay it
+            self._sim_ring = [
+                self._build_simulated_sample(now + k * TELEMETRY_INTERVAL)
+                for k in range(SIM_RING_SIZE)
+            ]
+        
+        gps, imu = self._sim_ring[self._sim_index]
+        self._sim_index = (self._sim_index + 1) % SIM_RING_SIZE
+        gps["timestamp"] = self._iso(now)
+        imu["ts"] = now
+        self.latest_gps = gps
+        self.latest_imu = imu
+    
+    def connect_mqtt(self) -> None:
+        """Start a non-blocking connection to the MQTT broker.
+        
+        paho's network thread makes the first connection and reconnects with
+        backoff (see reconnect_delay_set); _on_mqtt_connect re-subscribes.
+        """
+        self.mqtt_client.connect_async(MQTT_HOST, MQTT_PORT, keepalive=30)
+        self.mqtt_client.loop_start()
     
     def run(self) -> None:
         """Main telemetry aggregation loop."""
@@ -379,57 +537,73 @@ class TelemetryAggregator:
         if not self.dry_run:
             # Connect to MQTT broker
             self.mqtt_client = self.build_mqtt_client()
-            self.connect_mqtt_with_retries()
+            self.connect_mqtt()
         else:
             logging.info("Running in dry-run mode - simulating sensor data")
         
-        # Main loop
+        root_logger = logging.getLogger()
+        
+        # Main loop: sleep until the next tick on the monotonic clock instead
+        # of polling, waking early only for shutdown
+        next_deadline = time.monotonic()
         while not self.killer.should_stop:
+            remaining = next_deadline - time.monotonic()
+            if remaining > 0 and self.killer.wait(remaining):
+                break
+            next_deadline += TELEMETRY_INTERVAL
+            if next_deadline <= time.monotonic():
+                # Fell behind (e.g. a slow write); skip missed ticks
+                next_deadline = time.monotonic() + TELEMETRY_INTERVAL
+
             try:
-                now = time.time()
-                
                 # Simulate data in dry-run mode
                 if self.dry_run:
                     self.simulate_sensor_data()
                 
-                # Publish telemetry at configured interval
-                if now - self.last_telemetry_time >= TELEMETRY_INTERVAL:
-                    packet = self.create_telemetry_packet()
-                    
-                    # Write to log
-                    self.log_writer.write_packet(packet)
-                    
-                    # Publish to MQTT
-                    if not self.dry_run:
-                        self.publish_telemetry(packet)
-                    
-                    self.last_telemetry_time = now
-                    
-                    # Log summary
-                    gps_status = "GPS" if packet["gps"] else "NO_GPS"
-                    imu_status = "IMU" if packet["imu"] else "NO_IMU"
-                    logging.info("Telemetry: %s %s bat=%.1f%% lat=%.6f lon=%.6f pitch=%.1f roll=%.1f",
-                               gps_status, imu_status, packet["battery"]["percentage"],
-                               packet["gps"]["lat"] if packet["gps"] and packet["gps"]["lat"] else 0,
-                               packet["gps"]["lon"] if packet["gps"] and packet["gps"]["lon"] else 0,
-                               packet["imu"]["pitch_deg"] if packet["imu"] and packet["imu"]["pitch_deg"] else 0,
-                               packet["imu"]["roll_deg"] if packet["imu"] and packet["imu"]["roll_deg"] else 0)
+                packet = self.create_telemetry_packet()
+                # Serialize once for both the log and MQTT
+                payload = orjson.dumps(packet)
                 
-                time.sleep(0.1)  # Small sleep to prevent busy waiting
+                # Write to log
+                self.log_writer.write_packet(payload)
+                
+                # Publish to MQTT
+                if not self.dry_run:
+                    self.publish_telemetry(payload)
+                
+                # Log summary (skip building the arguments when INFO is off)
+                if root_logger.isEnabledFor(logging.INFO):
+                    gps = packet["gps"] or {}
+                    imu = packet["imu"] or {}
+                    logging.info("Telemetry: %s %s bat=%.1f%% lat=%.6f lon=%.6f pitch=%.1f roll=%.1f",
+                               "GPS" if gps else "NO_GPS", "IMU" if imu else "NO_IMU",
+                               packet["battery"]["percentage"],
+                               gps.get("lat") or 0, gps.get("lon") or 0,
+                               imu.get("pitch_deg") or 0, imu.get("roll_deg") or 0)
                 
             except Exception as exc:
                 logging.exception("Error in telemetry loop: %s", exc)
-                time.sleep(1.0)
+                self.killer.wait(1.0)
         
         # Cleanup
+        self.log_writer.close()
         if self.mqtt_client:
             try:
+                # Give the last queued packet a chance to reach the broker
+                if self._last_pub_info is not None and self.mqtt_client.is_connected():
+                    self._last_pub_info.wait_for_publish(2.0)
                 self.mqtt_client.loop_stop()
                 self.mqtt_client.disconnect()
             except Exception as exc:
                 logging.error("Error disconnecting MQTT: %s", exc)
         
         logging.info("Telemetry service stopped")
+    
+    def stop_logging(self) -> None:
+        """Stop the log listener thread, draining queued records first."""
+        if self._log_listener is not None:
+            self._log_listener.stop()
+            self._log_listener = None
 
 
 def main() -> None:
@@ -454,6 +628,9 @@ def main() -> None:
     except Exception as exc:
         logging.exception("Fatal error: %s", exc)
         sys.exit(1)
+    finally:
+        # Also on the error paths, after the fatal error is queued
+        aggregator.stop_logging()
 
 
 if __name__ == "__main__":
@@ -12,33 +12,48 @@ Features
 Performance tips
 - Use smaller input sizes (e.g., 300x300, 320x320). Control with --model_width/--model_height
 - Use --skip_frames to reduce inference frequency (e.g., process every 2nd/3rd frame)
+- --psnr_skip (opt-in) skips inference while the scene is static (thumbnail PSNR gate)
 - Use grayscale preview or avoid any extra drawing/display on the Pi
 - Ensure the Pi is in performance governor mode and use a heatsink/fan
+
+Performance notes (where the per-frame time goes)
+- Capture (grab/retrieve, YUYV->BGR) and preprocess (resize, BGR->RGB) are
+  memory-bound: they stream whole frames through the cache. Gains come from
+  touching fewer bytes (skip decoding, fuse steps into one reused buffer),
+  not from faster arithmetic.
+- TFLite invoke is mixed: convolutions are compute-bound, but moving
+  intermediate activations dominates memory traffic. Smaller inputs, INT8
+  models (scripts/quantize_detector_model.py) and delegates (XNNPACK,
+  --edgetpu) give the largest wins.
+- Postprocess and MQTT are small and Python-bound: keep them vectorized over
+  the top_k survivors and avoid per-detection objects.
+Hand-written SIMD is unlikely to pay off before these are exhausted.
 """
 
 from __future__ import annotations
 
 import argparse
-import json
 import logging
 import os
 import signal
 import sys
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Tuple
 
 import cv2  # type: ignore
 import numpy as np
+import orjson
 from paho.mqtt import client as mqtt  # type: ignore
 
 try:
     # Prefer standalone tflite-runtime on Raspberry Pi
-    from tflite_runtime.interpreter import Interpreter  # type: ignore
+    from tflite_runtime.interpreter import Interpreter, load_delegate  # type: ignore
 except Exception:  # noqa: BLE001
     # Fallback to full TF if installed (less ideal on Pi)
-    from tensorflow.lite.python.interpreter import Interpreter  # type: ignore
+    from tensorflow.lite.python.interpreter import Interpreter, load_delegate  # type: ignore
 
 
 # =============================
@@ -69,6 +84,30 @@ def now_ms() -> int:
     return int(time.time() * 1000)
 
 
+def pin_current_thread(cpus: set[int]) -> None:
+    """
+    Restrict the calling thread (by native thread id, not the whole process)
+    to ``cpus``. Threads it starts afterwards inherit the mask; threads that
+    already exist keep theirs. An empty set is a no-op.
+    """
+    if not cpus:
+        return
+    try:
+        os.sched_setaffinity(threading.get_native_id(), cpus)
+    except (AttributeError, OSError) as exc:  # Not Linux, or CPUs unavailable
+        logging.warning("Could not set CPU affinity: %s", exc)
+
+
+# Coral Edge TPU runtime (libedgetpu1-std / -max packages)
+EDGETPU_LIB = "libedgetpu.so.1"
+
+# Indexed by the severity codes postprocess_detections() computes
+SEVERITY_LEVELS = ("critical", "warning", "info")
+
+# Change-detection thumbnail (w, h): ~1% of a 640x480 frame's pixels
+THUMB_SIZE = (192, 108)
+
+
 # =============================
 # Models and post-processing
 # =============================
@@ -83,109 +122,161 @@ class Detection:
     severity: str
 
 
-def load_labels(labels_path: Path | None) -> List[str]:
-    default_labels = [
-        "background",
-        "person",
-        "bicycle",
-        "car",
-        "motorcycle",
-        "airplane",
-        "bus",
-        "train",
-        "truck",
-        "boat",
-        "traffic light",
-        "fire hydrant",
-        "street sign",
-        "stop sign",
-        "parking meter",
-        "bench",
-        "bird",
-        "cat",
-        "dog",
-        "horse",
-        "sheep",
-        "cow",
-        "elephant",
-        "bear",
-        "zebra",
-        "giraffe",
-        "hat",
-        "backpack",
-        "umbrella",
-        "shoe",
-        "eye glasses",
-        "handbag",
-        "tie",
-        "suitcase",
-        "frisbee",
-        "skis",
-        "snowboard",
-        "sports ball",
-        "kite",
-        "baseball bat",
-        "baseball glove",
-        "skateboard",
-        "surfboard",
-        "tennis racket",
-        "bottle",
-        "plate",
-        "wine glass",
-        "cup",
-        "fork",
-        "knife",
-        "spoon",
-        "bowl",
-        "banana",
-        "apple",
-        "sandwich",
-        "orange",
-        "broccoli",
-        "carrot",
-        "hot dog",
-        "pizza",
-        "donut",
-        "cake",
-        "chair",
-        "couch",
-        "potted plant",
-        "bed",
-        "mirror",
-        "dining table",
-        "window",
-        "desk",
-        "toilet",
-        "door",
-        "tv",
-        "laptop",
-        "mouse",
-        "remote",
-        "keyboard",
-        "cell phone",
-        "microwave",
-        "oven",
-        "toaster",
-        "sink",
-        "refrigerator",
-        "blender",
-        "book",
-        "clock",
-        "vase",
-        "scissors",
-        "teddy bear",
-        "hair drier",
-        "toothbrush",
-    ]
+@dataclass
+class Detections:
+    """
+    One frame's detections as parallel arrays (struct-of-arrays).
+
+    Postprocessing fills the columns with a few NumPy operations and the MQTT
+    publisher reads them back in one pass, so no per-detection objects are
+    built on the hot path. Iterating yields ``Detection`` views for callers
+    that want one object per detection.
+    """
+
+    labels: List[str]
+    conf: np.ndarray  # float32 [N]
+    xywh: np.ndarray  # int32 [N, 4], pixels of original frame
+    dist: np.ndarray  # float64 [N], metres; inf when unknown
+    severity: np.ndarray  # int8 [N], index into SEVERITY_LEVELS
+
+    @classmethod
+    def empty(cls) -> "Detections":
+        return cls(
+            labels=[],
+            conf=np.empty(0, dtype=np.float32),
+            xywh=np.empty((0, 4), dtype=np.int32),
+            dist=np.empty(0, dtype=np.float64),
+            severity=np.empty(0, dtype=np.int8),
+        )
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def rows(self) -> Iterator[Tuple[str, float, List[int], float | None, str]]:
+        """Yield (label, confidence, [x, y, w, h], distance_m, severity) per detection."""
+        for label, conf, xywh, dist, sev in zip(
+            self.labels, self.conf.tolist(), self.xywh.tolist(), self.dist.tolist(), self.severity.tolist()
+        ):
+            yield label, conf, xywh, None if dist == np.inf else dist, SEVERITY_LEVELS[sev]
+
+    def __iter__(self) -> Iterator[Detection]:
+        for label, conf, (x, y, w, h), dist, severity in self.rows():
+            yield Detection(label=label, confidence=conf, bbox_xywh=(x, y, w, h), distance_m=dist, severity=severity)
+
+
+# COCO labels, indexed by the class id MobileNet SSD emits
+DEFAULT_LABELS: Tuple[str, ...] = (
+    "background",
+    "person",
+    "bicycle",
+    "car",
+    "motorcycle",
+    "airplane",
+    "bus",
+    "train",
+    "truck",
+    "boat",
+    "traffic light",
+    "fire hydrant",
+    "street sign",
+    "stop sign",
+    "parking meter",
+    "bench",
+    "bird",
+    "cat",
+    "dog",
+    "horse",
+    "sheep",
+    "cow",
+    "elephant",
+    "bear",
+    "zebra",
+    "giraffe",
+    "hat",
+    "backpack",
+    "umbrella",
+    "shoe",
+    "eye glasses",
+    "handbag",
+    "tie",
+    "suitcase",
+    "frisbee",
+    "skis",
+    "snowboard",
+    "sports ball",
+    "kite",
+    "baseball bat",
+    "baseball glove",
+    "skateboard",
+    "surfboard",
+    "tennis racket",
+    "bottle",
+    "plate",
+    "wine glass",
+    "cup",
+    "fork",
+    "knife",
+    "spoon",
+    "bowl",
+    "banana",
+    "apple",
+    "sandwich",
+    "orange",
+    "broccoli",
+    "carrot",
+    "hot dog",
+    "pizza",
+    "donut",
+    "cake",
+    "chair",
+    "couch",
+    "potted plant",
+    "bed",
+    "mirror",
+    "dining table",
+    "window",
+    "desk",
+    "toilet",
+    "door",
+    "tv",
+    "laptop",
+    "mouse",
+    "remote",
+    "keyboard",
+    "cell phone",
+    "microwave",
+    "oven",
+    "toaster",
+    "sink",
+    "refrigerator",
+    "blender",
+    "book",
+    "clock",
+    "vase",
+    "scissors",
+    "teddy bear",
+    "hair drier",
+    "toothbrush",
+)
+
+
+def load_labels(labels_path: Path | None) -> Tuple[str, ...]:
     if labels_path is None:
-        return default_labels
+        return DEFAULT_LABELS
     try:
         with labels_path.open("r", encoding="utf-8") as f:
-            labels = [line.strip() for line in f if line.strip()]
-        return labels or default_labels
+            labels = tuple(line.strip() for line in f if line.strip())
+        return labels or DEFAULT_LABELS
     except Exception as exc:  # noqa: BLE001
         logging.warning("Failed to read labels %s: %s", labels_path, exc)
-        return default_labels
+        return DEFAULT_LABELS
+
+
+def parse_class_ids(spec: str | None) -> np.ndarray | None:
+    """Parse a comma-separated class id list ("1,2,3,6,8"); empty means all classes."""
+    if not spec:
+        return None
+    return np.array(sorted({int(part) for part in spec.split(",") if part.strip()}), dtype=np.int32)
 
 
 def estimate_distance_m(bbox_h_px: int, frame_h_px: int, k: float) -> float:
@@ -262,47 +353,135 @@ def select_tensors(interpreter: Interpreter) -> Tuple[int, int, int, int]:
     return boxes_i, classes_i, scores_i, count_i
 
 
-def preprocess(frame_bgr: np.ndarray, input_size: Tuple[int, int]) -> Tuple[np.ndarray, float, float]:
-    ih, iw = input_size
-    resized = cv2.resize(frame_bgr, (iw, ih))
-    rgb = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
-    input_data = np.expand_dims(rgb, axis=0).astype(np.uint8)
-    return input_data, frame_bgr.shape[1], frame_bgr.shape[0]
-
-
-def run_inference(
-    interpreter: Interpreter,
-    boxes_i: int,
-    classes_i: int,
-    scores_i: int,
-    count_i: int,
-    input_data: np.ndarray,
-) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+def load_model_profile(path: Path) -> Dict[str, Any]:
+    """
+    Read a per-model tensor profile, e.g. for mobilenet_ssd_v1.tflite:
+
+        {"input_shape": [1, 300, 300, 3], "input_dtype": "uint8",
+         "boxes_i": 175, "classes_i": 176, "scores_i": 177, "count_i": 178}
+
+    Float models may add "normalization": {"zero_point": 127.5, "scale": 0.0078125}
+    to override the input quantization parameters ((x - zero_point) * scale).
+    """
+    profile = orjson.loads(path.read_bytes())
+    required = ("input_shape", "input_dtype", "boxes_i", "classes_i", "scores_i", "count_i")
+    missing = [key for key in required if key not in profile]
+    if missing:
+        raise RuntimeError(f"Model profile {path} is missing {', '.join(missing)}")
+    return profile
+
+
+def apply_model_profile(interpreter: Interpreter, profile: Dict[str, Any]) -> Tuple[int, int, int, int]:
+    """Check the interpreter matches ``profile`` and return its output indices (see select_tensors())."""
     input_detail = interpreter.get_input_details()[0]
-    # Support quantized and float models
-    if input_detail["dtype"] == np.float32:
+    if list(input_detail["shape"]) != list(profile["input_shape"]) or np.dtype(input_detail["dtype"]) != np.dtype(
+        profile["input_dtype"]
+    ):
+        raise RuntimeError(
+            f"Model input {list(input_detail['shape'])} {np.dtype(input_detail['dtype'])} does not match profile "
+            f"{profile['input_shape']} {profile['input_dtype']}"
+        )
+    output_indices = {d["index"] for d in interpreter.get_output_details()}
+    mapped = (profile["boxes_i"], profile["classes_i"], profile["scores_i"], profile["count_i"])
+    if not output_indices.issuperset(mapped):
+        raise RuntimeError(f"Model profile output indices {mapped} not in model outputs {sorted(output_indices)}")
+    return mapped
+
+
+def preprocess(
+    frame_bgr: np.ndarray, input_size: Tuple[int, int], out: np.ndarray | None = None
+) -> Tuple[np.ndarray, float, float]:
+    """
+    Resize and convert a BGR frame into a [1, h, w, 3] uint8 RGB input tensor.
+
+    Pass a preallocated ``out`` buffer of that shape to fill it in place
+    (resize, then in-place colour swap) with no per-frame allocations.
+    """
+    ih, iw = input_size
+    if out is None:
+        out = np.empty((1, ih, iw, 3), dtype=np.uint8)
+    img = out[0]
+    cv2.resize(frame_bgr, (iw, ih), dst=img, interpolation=cv2.INTER_LINEAR)
+    cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=img)
+    return out, frame_bgr.shape[1], frame_bgr.shape[0]
+
+
+class InferenceSession:
+    """
+    TFLite interpreter with input/output lookups done once at startup.
+
+    Outputs are read through ``interpreter.tensor()`` views, which alias the
+    interpreter's buffers instead of copying them like ``get_tensor()``.
+    The views are only valid until the next ``run()``; callers must copy
+    (e.g. fancy-index) anything they keep, which the top-k step does.
+    """
+
+    def __init__(
+        self,
+        interpreter: Interpreter,
+        boxes_i: int,
+        classes_i: int,
+        scores_i: int,
+        count_i: int,
+        normalization: Dict[str, float] | None = None,
+    ) -> None:
+        self.interpreter = interpreter
+        input_detail = interpreter.get_input_details()[0]
+        self._input_index = input_detail["index"]
+        # Support quantized and float models
+        self._float_input = input_detail["dtype"] == np.float32
         input_scale, input_zero_point = input_detail.get("quantization", (1.0, 0))
-        if input_scale == 0:
-            input_scale = 1.0
-        x = input_data.astype(np.float32)
-        x = (x - input_zero_point) * input_scale  # normally scale to 0..1
-    else:
-        x = input_data
+        if normalization:
+            input_scale = normalization.get("scale", input_scale)
+            input_zero_point = normalization.get("zero_point", input_zero_point)
+        self._input_scale = input_scale or 1.0
+        self._input_zero_point = input_zero_point
+        # Float models: normalize into one reused buffer instead of two temporaries
+        self._input_f32 = np.empty(input_detail["shape"], dtype=np.float32) if self._float_input else None
+        self._boxes = interpreter.tensor(boxes_i)
+        self._classes = interpreter.tensor(classes_i)
+        self._scores = interpreter.tensor(scores_i)
+        self._count = interpreter.tensor(count_i) if count_i is not None else None
+
+    def warm_up(self, runs: int = 1) -> None:
+        """Run ``runs`` inferences on a blank input and log their latency."""
+        detail = self.interpreter.get_input_details()[0]
+        blank = np.zeros(detail["shape"], dtype=detail["dtype"])
+        latencies_ms = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            self.interpreter.set_tensor(self._input_index, blank)
+            self.interpreter.invoke()
+            latencies_ms.append((time.perf_counter() - t0) * 1000.0)
+        if latencies_ms:
+            logging.info(
+                "Warm-up: %d runs, first %.1f ms, last %.1f ms",
+                runs,
+                latencies_ms[0],
+                latencies_ms[-1],
+            )
+
+    def run(self, input_data: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        if self._input_f32 is not None:
+            x = self._input_f32
+            np.subtract(input_data, self._input_zero_point, out=x, dtype=np.float32)
+            np.multiply(x, self._input_scale, out=x)  # normally scale to 0..1
+        else:
+            x = input_data
 
-    interpreter.set_tensor(input_detail["index"], x)
-    interpreter.invoke()
+        self.interpreter.set_tensor(self._input_index, x)
+        self.interpreter.invoke()
 
-    boxes = interpreter.get_tensor(boxes_i)[0]
-    classes = interpreter.get_tensor(classes_i)[0]
-    scores = interpreter.get_tensor(scores_i)[0]
-    if count_i is not None:
-        try:
-            num = int(np.squeeze(interpreter.get_tensor(count_i)))
-        except Exception:  # noqa: BLE001
-            num = len(scores)
-    else:
+        boxes = self._boxes()[0]
+        classes = self._classes()[0]
+        scores = self._scores()[0]
         num = len(scores)
-    return boxes, classes, scores, num
+        if self._count is not None:
+            try:
+                num = int(np.squeeze(self._count()))
+            except Exception:  # noqa: BLE001
+                pass
+        return boxes, classes, scores, num
 
 
 def postprocess_detections(
@@ -312,34 +491,48 @@ def postprocess_detections(
     num: int,
     frame_w: int,
     frame_h: int,
-    labels: List[str],
+    labels: Tuple[str, ...],
     conf_threshold: float,
     distance_k: float | None,
-) -> List[Detection]:
-    detections: List[Detection] = []
-    for i in range(num):
-        conf = float(scores[i])
-        if conf < conf_threshold:
-            continue
-        ymin, xmin, ymax, xmax = boxes[i]
-        # TFLite mobilenet-ssd gives normalized coords
-        x1 = int(max(0, xmin) * frame_w)
-        y1 = int(max(0, ymin) * frame_h)
-        x2 = int(min(1, xmax) * frame_w)
-        y2 = int(min(1, ymax) * frame_h)
-        w = max(0, x2 - x1)
-        h = max(0, y2 - y1)
-        class_id = int(classes[i])
-        label = labels[class_id] if 0 <= class_id < len(labels) else f"class_{class_id}"
-
-        distance_m = None
-        if distance_k is not None and h > 0:
-            distance_m = round(estimate_distance_m(h, frame_h, distance_k), 2)
-        severity = compute_severity(conf, distance_m)
-        detections.append(
-            Detection(label=label, confidence=conf, bbox_xywh=(x1, y1, w, h), distance_m=distance_m, severity=severity)
-        )
-    return detections
+    allowed_classes: np.ndarray | None = None,
+) -> Detections:
+    # Threshold and convert boxes for all rows at once; only the survivors'
+    # labels go through Python
+    scores = scores[:num]
+    class_ids = classes[:num].astype(np.int32)
+    keep = scores >= conf_threshold
+    if allowed_classes is not None:
+        keep &= np.isin(class_ids, allowed_classes)
+    if not keep.any():
+        return Detections.empty()
+    conf_arr = scores[keep]
+    class_ids = class_ids[keep].tolist()
+    # TFLite mobilenet-ssd gives normalized coords (ymin, xmin, ymax, xmax)
+    ymin, xmin, ymax, xmax = boxes[:num][keep].T
+    x1 = (np.maximum(xmin, 0) * frame_w).astype(np.int32)
+    y1 = (np.maximum(ymin, 0) * frame_h).astype(np.int32)
+    x2 = (np.minimum(xmax, 1) * frame_w).astype(np.int32)
+    y2 = (np.minimum(ymax, 1) * frame_h).astype(np.int32)
+    w = np.maximum(x2 - x1, 0)
+    h = np.maximum(y2 - y1, 0)
+
+    # Same rules as estimate_distance_m()/compute_severity(), applied to all
+    # survivors at once; inf marks "no distance" for the severity thresholds
+    if distance_k is not None:
+        ratio = np.maximum(h / max(frame_h, 1), 1e-6)
+        dist = np.where(h > 0, np.round(distance_k / ratio, 2), np.inf)
+    else:
+        dist = np.full(len(h), np.inf)
+    severity_idx = np.select([dist < 5, dist < 15, conf_arr >= 0.6], [0, 1, 1], default=2)
+
+    n_labels = len(labels)
+    return Detections(
+        labels=[labels[c] if 0 <= c < n_labels else f"class_{c}" for c in class_ids],
+        conf=conf_arr,
+        xywh=np.stack((x1, y1, w, h), axis=1),
+        dist=dist,
+        severity=severity_idx.astype(np.int8),
+    )
 
 
 # =============================
@@ -352,36 +545,45 @@ def make_mqtt_client(client_id: str, host: str, port: int, username: str | None,
     if username and password:
         client.username_pw_set(username=username, password=password)
     client.connect(host, port, keepalive=30)
+    # Network thread sends queued publishes and processes QoS 1 acks; without
+    # it the in-flight window fills and later events are never delivered
+    client.loop_start()
     return client
 
 
-def publish_obstacle(client: mqtt.Client, drone_id: str, det: Detection) -> None:
+def obstacle_topic(drone_id: str) -> str:
+    return f"drone/{drone_id}/obstacles"
+
+
+def publish_obstacles(client: mqtt.Client, topic: str, drone_id: str, dets: Detections) -> None:
     """
-    Publish obstacle detection event to MQTT.
+    Publish one frame's obstacle detection events to MQTT.
     
-    Publishes to topic: drone/<drone_id>/obstacles
-    Message format matches mission runner expectations for automatic
-    pause/resume behavior.
+    Publishes one message per detection to ``topic`` (drone/<drone_id>/obstacles,
+    see obstacle_topic()). Message format matches mission runner expectations
+    for automatic pause/resume behavior. publish() only enqueues; the client's
+    network thread does the socket writes.
     
     Args:
         client: MQTT client instance
+        topic: Obstacle topic, built once at startup
         drone_id: Unique drone identifier
-        det: Detection object with bbox, confidence, and metadata
+        dets: One frame's detections (labels, confidences, bboxes, distances, severities)
     """
-    x, y, w, h = det.bbox_xywh
-    payload: Dict[str, Any] = {
-        "timestamp_ms": now_ms(),
-        "drone_id": drone_id,
-        "event": "obstacle",
-        "label": det.label,
-        "confidence": round(det.confidence, 3),
-        "bbox": {"x": x, "y": y, "w": w, "h": h},
-        "severity": det.severity,
-    }
-    if det.distance_m is not None:
-        payload["distance_m"] = det.distance_m
-    topic = f"drone/{drone_id}/obstacles"
-    client.publish(topic, json.dumps(payload), qos=1, retain=False)
+    timestamp_ms = now_ms()
+    for label, conf, (x, y, w, h), distance_m, severity in dets.rows():
+        payload: Dict[str, Any] = {
+            "timestamp_ms": timestamp_ms,
+            "drone_id": drone_id,
+            "event": "obstacle",
+            "label": label,
+            "confidence": round(conf, 3),
+            "bbox": {"x": x, "y": y, "w": w, "h": h},
+            "severity": severity,
+        }
+        if distance_m is not None:
+            payload["distance_m"] = distance_m
+        client.publish(topic, orjson.dumps(payload), qos=1, retain=False)
 
 
 # =============================
@@ -394,11 +596,70 @@ def open_camera(width: int, height: int, fps: int) -> cv2.VideoCapture:
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
     cap.set(cv2.CAP_PROP_FPS, fps)
+    # Only keep the newest frame in the driver queue (ignored by some backends)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
     if not cap.isOpened():
         raise RuntimeError("Failed to open camera")
     return cap
 
 
+class CameraThread:
+    """
+    Grab frames on a daemon thread and keep only the newest one.
+
+    Capture overlaps with inference, and a slow inference frame never leaves
+    a backlog of stale frames in the driver queue: the loop always sees the
+    freshest image.
+
+    Every frame is dequeued with ``grab()``, but only every ``every``-th one
+    is decoded with ``retrieve()``; skipped frames never pay for the colour
+    conversion and copy into a new array. ``seq`` counts grabbed frames.
+    """
+
+    def __init__(self, cap: cv2.VideoCapture, every: int = 1) -> None:
+        self._cap = cap
+        self._every = max(1, every)
+        self._grabbed = 0
+        self._cond = threading.Condition()
+        self._frame: np.ndarray | None = None
+        self._seq = 0
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="camera", daemon=True)
+
+    def start(self) -> "CameraThread":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stopped:
+            if not self._cap.grab():
+                logging.warning("Frame grab failed")
+                time.sleep(0.005)
+                continue
+            self._grabbed += 1
+            if self._grabbed % self._every != 0:
+                continue
+            ok, frame = self._cap.retrieve()
+            if not ok:
+                logging.warning("Frame retrieve failed")
+                continue
+            # retrieve() returns a fresh array each call, so handing it over is safe
+            with self._cond:
+                self._frame = frame
+                self._seq = self._grabbed
+                self._cond.notify()
+
+    def latest(self, last_seq: int, timeout: float = 1.0) -> Tuple[int, np.ndarray | None]:
+        """Wait for a frame newer than ``last_seq``; returns (seq, frame)."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq != last_seq or self._stopped, timeout)
+            return self._seq, self._frame
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._thread.join(timeout=1.0)
+
+
 # =============================
 # Main loop
 # =============================
@@ -424,9 +685,27 @@ def main() -> None:
         default=Path(os.getenv("LABELS_PATH", "models/coco_labels.txt")),
         help="Path to labels file (one per line)",
     )
+    parser.add_argument(
+        "--model_profile",
+        type=Path,
+        default=Path(os.environ["MODEL_PROFILE"]) if os.getenv("MODEL_PROFILE") else None,
+        help="JSON file with the model's input shape/dtype and output tensor indices; skips output auto-detection",
+    )
     parser.add_argument("--conf_threshold", type=float, default=float(os.getenv("CONF_THRESHOLD", "0.5")))
     parser.add_argument("--top_k", type=int, default=int(os.getenv("TOP_K", "20")))
+    parser.add_argument(
+        "--classes_of_interest",
+        default=os.getenv("CLASSES_OF_INTEREST", ""),
+        help="Comma-separated class ids to report, e.g. 1,2,3,6,8 (person,bicycle,car,bus,truck); empty reports all",
+    )
     parser.add_argument("--skip_frames", type=int, default=int(os.getenv("SKIP_FRAMES", "2")), help="Process every Nth frame")
+    parser.add_argument(
+        "--psnr_skip",
+        type=float,
+        default=float(os.getenv("PSNR_SKIP", "0")),
+        help="Skip inference, and reporting, while the frame thumbnail PSNR vs the last inferred frame exceeds "
+        "this, e.g. 35 (0, the default, disables)",
+    )
     parser.add_argument("--distance_k", type=float, default=float(os.getenv("DIST_K", "40.0")), help="Heuristic distance constant")
 
     parser.add_argument("--cam_width", type=int, default=int(os.getenv("CAM_W", "640")))
@@ -434,6 +713,30 @@ def main() -> None:
     parser.add_argument("--cam_fps", type=int, default=int(os.getenv("CAM_FPS", "15")))
     parser.add_argument("--model_width", type=int, default=int(os.getenv("MODEL_W", "300")))
     parser.add_argument("--model_height", type=int, default=int(os.getenv("MODEL_H", "300")))
+    parser.add_argument(
+        "--num_threads",
+        type=int,
+        default=int(os.getenv("TFLITE_THREADS", str(max(1, (os.cpu_count() or 1) - 1)))),
+        help="TFLite interpreter threads; inference is pinned to cores 0..N-1, camera/MQTT to the rest",
+    )
+    parser.add_argument(
+        "--warmup_runs",
+        type=int,
+        default=int(os.getenv("WARMUP_RUNS", "20")),
+        help="Blank inferences to run before the first camera frame",
+    )
+    parser.add_argument(
+        "--edgetpu",
+        action="store_true",
+        default=os.getenv("EDGETPU", "false").lower() == "true",
+        help="Run on a Coral Edge TPU (requires libedgetpu and a *_edgetpu.tflite model)",
+    )
+    parser.add_argument(
+        "--delegate",
+        default=os.getenv("TFLITE_DELEGATE"),
+        help="Optional external delegate library (e.g. libtensorflowlite_xnnpack_delegate.so); "
+        "recent tflite-runtime wheels already apply XNNPACK to float models by default",
+    )
     parser.add_argument("-v", "--verbose", action="count", default=1)
 
     args = parser.parse_args()
@@ -448,19 +751,68 @@ def main() -> None:
     )
 
     labels = load_labels(args.labels_path if args.labels_path.exists() else None)
+    allowed_classes = parse_class_ids(args.classes_of_interest)
+    if allowed_classes is not None:
+        logging.info(
+            "Reporting only classes: %s",
+            ", ".join(labels[i] if 0 <= i < len(labels) else f"class_{i}" for i in allowed_classes.tolist()),
+        )
 
     # Load model
     if not args.model_path.exists():
         logging.error("Model not found at %s", args.model_path)
         sys.exit(2)
-    interpreter = Interpreter(model_path=str(args.model_path))
+    # Inference (this thread, plus the interpreter's worker pool, which
+    # inherits its mask) runs on the first num_threads cores; the camera and
+    # MQTT network threads are started on the rest. Keep OpenCV
+    # single-threaded so it does not compete with the interpreter's pool
+    cv2.setNumThreads(1)
+    try:
+        cpus = sorted(os.sched_getaffinity(0))
+    except AttributeError:  # Not Linux
+        cpus = []
+    inference_cpus = set(cpus[: args.num_threads])
+    io_cpus = set(cpus[args.num_threads :]) or set(cpus)
+    pin_current_thread(inference_cpus)
+    delegate_path = args.delegate
+    if args.edgetpu:
+        delegate_path = EDGETPU_LIB
+        if "_edgetpu" not in args.model_path.stem:
+            logging.warning("--edgetpu expects an Edge TPU compiled model (*_edgetpu.tflite), got %s", args.model_path)
+    delegates = []
+    if delegate_path:
+        try:
+            delegates.append(load_delegate(delegate_path))
+            logging.info("Loaded TFLite delegate %s", delegate_path)
+        except Exception as exc:  # noqa: BLE001
+            logging.warning("Failed to load delegate %s (%s); using built-in kernels", delegate_path, exc)
+    # model_path (not model_content) lets TFLite mmap the file read-only, so
+    # weights are demand-paged from the page cache rather than copied into the heap
+    interpreter = Interpreter(
+        model_path=str(args.model_path),
+        num_threads=args.num_threads,
+        experimental_delegates=delegates or None,
+    )
     interpreter.allocate_tensors()
-    boxes_i, classes_i, scores_i, count_i = select_tensors(interpreter)
+    if args.model_profile is not None:
+        # The deployed model is known up front: use its recorded mapping and
+        # fail fast if the file on disk is a different model
+        profile = load_model_profile(args.model_profile)
+        session = InferenceSession(
+            interpreter, *apply_model_profile(interpreter, profile), normalization=profile.get("normalization")
+        )
+        logging.info("Using model profile %s", args.model_profile)
+    else:
+        session = InferenceSession(interpreter, *select_tensors(interpreter))
+    # The first invokes do one-time work (delegate upload, weight packing,
+    # page-faulting the model); pay it now rather than on the first frames
+    session.warm_up(args.warmup_runs)
 
     # Camera
     cap = open_camera(args.cam_width, args.cam_height, args.cam_fps)
 
-    # MQTT
+    # MQTT; its network thread (and the camera thread below) inherit io_cpus
+    pin_current_thread(io_cpus)
     try:
         mqtt_client = make_mqtt_client(
             client_id=f"detector-{args.drone_id}",
@@ -474,33 +826,41 @@ def main() -> None:
         sys.exit(3)
 
     killer = GracefulKiller()
+    topic = obstacle_topic(args.drone_id)
+
+    # Model input tensor, refilled in place every inference frame
+    input_buf = np.empty((1, args.model_height, args.model_width, 3), dtype=np.uint8)
 
-    frame_idx = 0
+    # The camera thread only decodes every skip_frames-th frame
+    camera = CameraThread(cap, every=args.skip_frames).start()
+    pin_current_thread(inference_cpus)
+    frame_seq = 0
+    last_thumb: np.ndarray | None = None
     last_fps_t = time.time()
     frames_in_window = 0
 
     try:
         while not killer.stop:
-            ok, frame = cap.read()
-            if not ok:
-                logging.warning("Frame grab failed")
-                time.sleep(0.005)
-                continue
-
-            frame_idx += 1
-            frames_in_window += 1
-
-            if args.skip_frames > 1 and (frame_idx % args.skip_frames) != 0:
-                # Skip inference to save CPU
-                # Still keep FPS accounting
+            seq, frame = camera.latest(frame_seq)
+            if seq == frame_seq:
+                continue  # No new frame within the timeout
+            # Count grabbed frames, including those skipped without decoding
+            frames_in_window += seq - frame_seq
+            frame_seq = seq
+
+            thumb = cv2.resize(frame, THUMB_SIZE, interpolation=cv2.INTER_AREA)
+            if args.psnr_skip > 0 and last_thumb is not None and cv2.PSNR(thumb, last_thumb) > args.psnr_skip:
+                # Scene unchanged since the last inference, whose detections were
+                # already reported; republishing them would stamp old obstacles as new
                 pass
             else:
-                input_data, frame_w, frame_h = preprocess(frame, (args.model_height, args.model_width))
-                boxes, classes, scores, num = run_inference(
-                    interpreter, boxes_i, classes_i, scores_i, count_i, input_data
-                )
-                # Keep only top_k by confidence
-                idxs = np.argsort(scores)[::-1][: args.top_k]
+                last_thumb = thumb
+                input_data, frame_w, frame_h = preprocess(frame, (args.model_height, args.model_width), input_buf)
+                boxes, classes, scores, num = session.run(input_data)
+                # Keep only top_k by confidence: linear partition, then sort just those k
+                k = min(args.top_k, len(scores))
+                part = np.argpartition(-scores, k - 1)[:k] if k > 0 else np.arange(0)
+                idxs = part[np.argsort(-scores[part])]
                 boxes = boxes[idxs]
                 classes = classes[idxs]
                 scores = scores[idxs]
@@ -514,14 +874,15 @@ def main() -> None:
                     labels,
                     args.conf_threshold,
                     distance_k=args.distance_k,
+                    allowed_classes=allowed_classes,
                 )
 
-                for det in detections:
+                for label, conf, (x, y, w, h), distance_m, severity in detections.rows():
                     # Print concise human-readable line
-                    x, y, w, h = det.bbox_xywh
-                    dist = f", {det.distance_m}m" if det.distance_m is not None else ""
-                    print(f"[{det.severity}] {det.label} {det.confidence:.2f} bbox=({x},{y},{w},{h}){dist}")
-                    publish_obstacle(mqtt_client, args.drone_id, det)
+                    dist = f", {distance_m}m" if distance_m is not None else ""
+                    print(f"[{severity}] {label} {conf:.2f} bbox=({x},{y},{w},{h}){dist}")
+                if detections:
+                    publish_obstacles(mqtt_client, topic, args.drone_id, detections)
 
             # FPS log once per second
             now = time.time()
@@ -534,11 +895,13 @@ def main() -> None:
         logging.exception("Detector crashed: %s", exc)
     finally:
         try:
+            camera.stop()
             cap.release()
         except Exception:  # noqa: BLE001
             pass
         try:
             mqtt_client.disconnect()
+            mqtt_client.loop_stop()
         except Exception:  # noqa: BLE001
             pass
         logging.info("detector stopped")
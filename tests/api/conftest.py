@@ -0,0 +1,116 @@
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+import os
+from typing import AsyncGenerator, Optional
+
+import uvloop
+
+# bcrypt hash for users created by token_for(); they never log in
+TOKEN_USER_PASSWORD_HASH = "$2b$12$BgKhPGiPQJbREnTX9rIwSuZkumX6hXifpxUC9yHnYnWFYkWt5QVXC"
+
+def pytest_asyncio_loop_factories(config, item):
+    # Run the API tests on uvloop's libuv loop; pytest-asyncio 1.x builds the
+    # session loop from this factory (event_loop_policy overrides are deprecated)
+    return {"uvloop": uvloop.new_event_loop}
+
+# app.db needs DATABASE_URL at import time, so the fixtures import the app lazily
+
+@pytest.fixture(scope="session")
+def fast_password_hashing():
+    from passlib.context import CryptContext
+
+    # Real bcrypt at the minimum cost factor: hashing at the production cost
+    # (~100ms each) dominates the API tests. verify() still reads the cost
+    # from the hash, so precomputed production-cost hashes keep working
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("app.utils.auth.pwd_context", CryptContext(schemes=["bcrypt"], bcrypt__rounds=4))
+        yield
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def setup_db():
+    from app.db import Base, engine
+
+    # Under pytest-xdist (pytest -n auto --dist loadfile) each worker gets its
+    # own schema so parallel workers never drop each other's tables
+    schema = f"test_{os.environ['PYTEST_XDIST_WORKER']}" if os.getenv("PYTEST_XDIST_WORKER") else None
+    if schema:
+        async with engine.begin() as conn:
+            await conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{schema}"'))
+        engine = engine.execution_options(schema_translate_map={None: schema})
+
+    # Create tables once for the whole run
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    # Clean up
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        if schema:
+            await conn.execute(text(f'DROP SCHEMA IF EXISTS "{schema}" CASCADE'))
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def db(setup_db, fast_password_hashing) -> AsyncGenerator[AsyncSession, None]:
+    from app.main import app
+    from app.db import get_db
+
+    # Run each test inside one outer transaction and roll it back afterwards;
+    # commits made by the app only release savepoints inside it
+    async with setup_db.connect() as conn:
+        trans = await conn.begin()
+        session_factory = async_sessionmaker(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+
+        async def override_get_db():
+            async with session_factory() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            async with session_factory() as session:
+                yield session
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            await trans.rollback()
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def http_client() -> AsyncGenerator:
+    from app.main import app
+
+    # One ASGI transport and client for the whole run
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def async_client(http_client: AsyncClient, db: AsyncSession) -> AsyncClient:
+    # Per-test state lives in the db fixture's rolled-back transaction
+    return http_client
+
+@pytest.fixture
+def token_for(db: AsyncSession):
+    """Return an async helper that inserts a user with ``role`` and mints its JWT.
+
+    Skips /auth/register and /auth/login (and their bcrypt work) for tests
+    that only need an authenticated caller; test_auth.py covers that path.
+    """
+    from app.models.user import User
+    from app.utils.auth import create_access_token
+
+    async def _token_for(role, email: Optional[str] = None, name: Optional[str] = None) -> str:
+        user = User(
+            email=email or f"{role.value}@test.com",
+            name=name or f"Test {role.value.title()}",
+            password_hash=TOKEN_USER_PASSWORD_HASH,
+            role=role,
+        )
+        db.add(user)
+        await db.commit()
+        return create_access_token({"sub": str(user.id)})
+
+    return _token_for
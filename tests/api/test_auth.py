@@ -0,0 +1,82 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from app.models.user import User, UserRole
+from app.utils.auth import create_access_token, verify_password
+
+# Test data
+TEST_USER = {
+    "email": "test@example.com",
+    "password": "testpassword123",
+    "name": "Test User",
+    "role": UserRole.OPERATOR
+}
+
+# bcrypt hash of TEST_USER["password"] at the production cost factor (12)
+TEST_USER_PASSWORD_HASH = "$2b$12$2TNk843FCRXKevGIb8VlyO12I8D.P6F9myIKohQ79VsaDUKrkzkJW"
+
+def test_verify_password_production_cost():
+    # The API tests hash at bcrypt's minimum cost (see conftest.py); check a
+    # production-cost hash still verifies through the real context
+    assert verify_password(TEST_USER["password"], TEST_USER_PASSWORD_HASH)
+    assert not verify_password("wrongpassword", TEST_USER_PASSWORD_HASH)
+
+@pytest.mark.asyncio
+async def test_register_user(async_client: AsyncClient):
+    response = await async_client.post("/auth/register", json=TEST_USER)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["email"] == TEST_USER["email"]
+    assert data["name"] == TEST_USER["name"]
+    assert data["role"] == TEST_USER["role"]
+    assert "id" in data
+    assert "password_hash" not in data
+
+@pytest_asyncio.fixture
+async def registered_user(async_client: AsyncClient):
+    response = await async_client.post("/auth/register", json=TEST_USER)
+    assert response.status_code == 200
+    return response.json()
+
+@pytest.mark.asyncio
+async def test_register_duplicate_email(async_client: AsyncClient, registered_user):
+    # Attempt duplicate registration
+    response = await async_client.post("/auth/register", json=TEST_USER)
+    assert response.status_code == 400
+    assert "Email already registered" in response.json()["detail"]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("password,expected_status", [
+    (TEST_USER["password"], 200),
+    ("wrongpassword", 401),
+])
+async def test_login(async_client: AsyncClient, registered_user, password: str, expected_status: int):
+    response = await async_client.post(
+        "/auth/login",
+        data={
+            "username": TEST_USER["email"],
+            "password": password
+        }
+    )
+    assert response.status_code == expected_status
+    if expected_status == 200:
+        data = response.json()
+        assert "access_token" in data
+        assert data["token_type"] == "bearer"
+
+@pytest.mark.asyncio
+async def test_get_me(async_client: AsyncClient, registered_user):
+    # Mint the token directly; test_login covers the login round-trip
+    token = create_access_token({"sub": registered_user["id"]})
+    
+    # Get user profile
+    response = await async_client.get(
+        "/auth/me",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["email"] == TEST_USER["email"]
+    assert data["name"] == TEST_USER["name"]
+    assert data["role"] == TEST_USER["role"]
\ No newline at end of file
@@ -0,0 +1,61 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.disaster import DisasterType
+from app.models.user import UserRole
+
+TEST_DISASTER_TYPE = {
+    "name": "Flood",
+    "description": "Flooding disaster"
+}
+
+@pytest_asyncio.fixture
+async def admin_token(token_for):
+    return await token_for(UserRole.ADMIN)
+
+@pytest_asyncio.fixture
+async def disaster_type(db: AsyncSession):
+    disaster_type = DisasterType(**TEST_DISASTER_TYPE)
+    db.add(disaster_type)
+    await db.commit()
+    return disaster_type
+
+@pytest.mark.asyncio
+async def test_create_disaster_type(async_client: AsyncClient, admin_token: str):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.post("/disaster-types", json=TEST_DISASTER_TYPE, headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["name"] == TEST_DISASTER_TYPE["name"]
+    assert data["description"] == TEST_DISASTER_TYPE["description"]
+    assert "id" in data
+
+    # Names are unique
+    response = await async_client.post("/disaster-types", json=TEST_DISASTER_TYPE, headers=headers)
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_create_disaster_type_admin_only(async_client: AsyncClient, token_for):
+    token = await token_for(UserRole.DISPATCHER)
+    response = await async_client.post(
+        "/disaster-types",
+        json=TEST_DISASTER_TYPE,
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_create_disaster(async_client: AsyncClient, admin_token: str, disaster_type):
+    response = await async_client.post(
+        "/disasters",
+        json={"disaster_type_id": str(disaster_type.id), "description": "River burst its banks"},
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "reported"
+    # The response nests the disaster type
+    assert data["disaster_type"]["id"] == str(disaster_type.id)
+    assert data["disaster_type"]["name"] == TEST_DISASTER_TYPE["name"]
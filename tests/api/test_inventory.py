@@ -1,11 +1,12 @@
 import pytest
+import pytest_asyncio
 from httpx import AsyncClient
 import uuid
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.inventory import InventoryItem, ItemType, UnitType, SupplyTemplate
 from app.models.disaster import DisasterType
-from app.models.user import User, UserRole
-from app.utils.auth import create_access_token
+from app.models.user import UserRole
+from app.schemas.inventory import InventoryItemResponse
 
 # Test data
 TEST_ADMIN = {
@@ -32,25 +33,11 @@ TEST_ITEMS = [
     }
 ]
 
-@pytest.fixture
-async def admin_token(async_client: AsyncClient):
-    # Register admin user
-    response = await async_client.post("/auth/register", json=TEST_ADMIN)
-    assert response.status_code == 200
-    admin_data = response.json()
-    
-    # Login to get token
-    login_response = await async_client.post(
-        "/auth/login",
-        data={
-            "username": TEST_ADMIN["email"],
-            "password": TEST_ADMIN["password"]
-        }
-    )
-    assert login_response.status_code == 200
-    return login_response.json()["access_token"]
+@pytest_asyncio.fixture
+async def admin_token(token_for):
+    return await token_for(TEST_ADMIN["role"], email=TEST_ADMIN["email"], name=TEST_ADMIN["name"])
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def disaster_type(db: AsyncSession):
     disaster_type = DisasterType(
         name="Flood",
@@ -61,18 +48,28 @@ async def disaster_type(db: AsyncSession):
     await db.refresh(disaster_type)
     return disaster_type
 
-@pytest.fixture
-async def inventory_items(async_client: AsyncClient, admin_token: str):
-    items = []
-    for item_data in TEST_ITEMS:
-        response = await async_client.post(
-            "/inventory",
-            json=item_data,
-            headers={"Authorization": f"Bearer {admin_token}"}
-        )
-        assert response.status_code == 200
-        items.append(response.json())
-    return items
+@pytest_asyncio.fixture
+async def inventory_items(db: AsyncSession):
+    # One bulk insert and commit instead of a POST /inventory per item
+    items = [InventoryItem(**item_data) for item_data in TEST_ITEMS]
+    db.add_all(items)
+    await db.commit()
+    # Same shape as the POST /inventory response
+    return [InventoryItemResponse.model_validate(item).model_dump(mode="json") for item in items]
+
+@pytest.mark.parametrize("weights,quantities,expected", [
+    ([1000, 500], [2, 2], 3000),
+    ([1000, 500], [1, 3], 2500),
+    ([250.5], [4], 1002),
+    ([1000, 500], [0.5, 1], 1000),
+])
+def test_compute_total_weight(weights, quantities, expected):
+    items = [
+        InventoryItem(id=uuid.uuid4(), name=f"Item {i}", weight_grams=weight)
+        for i, weight in enumerate(weights)
+    ]
+    quantity_by_id = {item.id: quantity for item, quantity in zip(items, quantities)}
+    assert SupplyTemplate.compute_total_weight(items, quantity_by_id) == expected
 
 @pytest.mark.asyncio
 async def test_supply_template_weight_calculation(
@@ -109,6 +106,28 @@ async def test_supply_template_weight_calculation(
     )
     
     assert template["total_weight_grams"] == expected_weight
+    assert template["items"] == template_data["items"]
+
+@pytest.mark.asyncio
+async def test_list_supply_templates(
+    async_client: AsyncClient,
+    admin_token: str,
+    disaster_type,
+    inventory_items
+):
+    # Items are stored as JSON and read back through SupplyTemplate.items
+    items = [{"item_id": item["id"], "quantity": 1} for item in inventory_items]
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.post(
+        "/supply-templates",
+        json={"name": "Water Pack", "disaster_type_id": str(disaster_type.id), "items": items},
+        headers=headers
+    )
+    assert response.status_code == 200
+
+    response = await async_client.get(f"/supply-templates/{disaster_type.id}", headers=headers)
+    assert response.status_code == 200
+    assert [template["items"] for template in response.json()] == [items]
 
 @pytest.mark.asyncio
 async def test_supply_template_with_invalid_items(
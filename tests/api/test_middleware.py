@@ -0,0 +1,25 @@
+import logging
+import uuid
+
+import pytest
+from httpx import AsyncClient
+
+MIDDLEWARE_LOGGER = "app.middleware.logging"
+
+async def logged_request_ids(async_client: AsyncClient, caplog, headers=None) -> set:
+    with caplog.at_level(logging.INFO, logger=MIDDLEWARE_LOGGER):
+        response = await async_client.get("/auth/me", headers=headers)
+    assert response.status_code == 401
+    return {record.request_id for record in caplog.records if record.name == MIDDLEWARE_LOGGER}
+
+@pytest.mark.asyncio
+async def test_request_id_from_header(async_client: AsyncClient, caplog):
+    # The request and response log lines carry the caller's X-Request-ID
+    ids = await logged_request_ids(async_client, caplog, headers={"X-Request-ID": "req-123"})
+    assert ids == {"req-123"}
+
+@pytest.mark.asyncio
+async def test_request_id_minted(async_client: AsyncClient, caplog):
+    ids = await logged_request_ids(async_client, caplog)
+    assert len(ids) == 1
+    uuid.UUID(ids.pop())
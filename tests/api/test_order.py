@@ -0,0 +1,101 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.disaster import DisasterType, Disaster, Location
+from app.models.drone import Drone
+from app.models.inventory import InventoryItem, ItemType, UnitType
+from app.models.order import Order
+from app.models.user import User, UserRole
+
+TEST_ITEM = {
+    "name": "Water Bottle",
+    "type": ItemType.WATER,
+    "stock_quantity": 100,
+    "unit": UnitType.PIECE,
+    "weight_grams": 1000
+}
+
+@pytest_asyncio.fixture
+async def admin_token(token_for):
+    return await token_for(UserRole.ADMIN)
+
+@pytest_asyncio.fixture
+async def inventory_item(db: AsyncSession):
+    item = InventoryItem(**TEST_ITEM)
+    db.add(item)
+    await db.commit()
+    return item
+
+@pytest_asyncio.fixture
+async def location(db: AsyncSession):
+    # Reported by a user that never logs in
+    reporter = User(email="reporter@test.com", name="Reporter", password_hash="-", role=UserRole.OPERATOR)
+    disaster_type = DisasterType(name="Flood")
+    disaster = Disaster(disaster_type=disaster_type, description="Test disaster", creator=reporter)
+    location = Location(name="Test Location", latitude=12.9716, longitude=77.5946, disaster=disaster)
+    db.add_all([reporter, disaster_type, disaster, location])
+    await db.commit()
+    return location
+
+@pytest_asyncio.fixture
+async def order(db: AsyncSession, location):
+    order = Order(
+        user_id=location.disaster.created_by,
+        disaster_id=location.disaster_id,
+        location_id=location.id,
+        people_affected=50,
+        total_weight_grams=2000
+    )
+    db.add(order)
+    await db.commit()
+    return order
+
+@pytest_asyncio.fixture
+async def drone(db: AsyncSession):
+    drone = Drone(identifier="TEST-DRONE-001", payload_capacity_grams=5000)
+    db.add(drone)
+    await db.commit()
+    return drone
+
+@pytest.mark.asyncio
+async def test_create_order(async_client: AsyncClient, admin_token: str, inventory_item, location):
+    response = await async_client.post(
+        "/orders",
+        json={
+            "disaster_id": str(location.disaster_id),
+            "location_id": str(location.id),
+            "people_affected": 50,
+            "items": [{"item_id": str(inventory_item.id), "quantity": 2}]
+        },
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 200
+    order = response.json()
+    assert order["status"] == "pending"
+    assert order["total_weight_grams"] == 2 * TEST_ITEM["weight_grams"]
+    # Line items carry the inventory item's name and weight
+    [item] = order["items"]
+    assert item["item_id"] == str(inventory_item.id)
+    assert item["quantity"] == 2
+    assert item["item_name"] == TEST_ITEM["name"]
+    assert item["item_weight_grams"] == TEST_ITEM["weight_grams"]
+
+@pytest.mark.asyncio
+async def test_create_mission(async_client: AsyncClient, admin_token: str, order, drone):
+    waypoints = [
+        {"lat": "12.971600", "lon": "77.594600", "alt": 100.0, "hold_time": 0},
+        {"lat": "12.975000", "lon": "77.600000", "alt": 50.0, "hold_time": 30},
+    ]
+    response = await async_client.post(
+        "/missions",
+        json={"order_id": str(order.id), "drone_id": str(drone.id), "waypoints": waypoints},
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 200
+    mission = response.json()
+    assert mission["status"] == "assigned"
+    # The response nests the waypoints in flight order
+    assert [wp["sequence_order"] for wp in mission["waypoints"]] == [0, 1]
+    assert [wp["hold_time"] for wp in mission["waypoints"]] == [0, 30]
@@ -1,4 +1,5 @@
 import pytest
+import pytest_asyncio
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
@@ -31,7 +32,7 @@ TEST_INVENTORY_ITEM = {
     "weight_grams": 1000
 }
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def admin_token(async_client: AsyncClient):
     # Register admin user
     response = await async_client.post("/auth/register", json=TEST_ADMIN)
@@ -48,7 +49,7 @@ async def admin_token(async_client: AsyncClient):
     assert login_response.status_code == 200
     return login_response.json()["access_token"]
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def test_drone(async_client: AsyncClient, admin_token: str):
     response = await async_client.post(
         "/drones",
@@ -58,7 +59,7 @@ async def test_drone(async_client: AsyncClient, admin_token: str):
     assert response.status_code == 200
     return response.json()
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def test_inventory(async_client: AsyncClient, admin_token: str):
     response = await async_client.post(
         "/inventory",
@@ -0,0 +1,25 @@
+import pytest
+
+import orjson
+
+# The API fixtures live in tests/api/conftest.py, so the sensor, mission and
+# vision tests collect without httpx/sqlalchemy installed
+
+@pytest.fixture
+def assert_published():
+    """Return a helper that checks a mock MQTT client published once.
+
+    ``assert_published(client, topic_substr, **fields)`` checks the topic
+    contains ``topic_substr`` and each field of the decoded JSON payload,
+    then returns the payload for any nested checks.
+    """
+    def _assert_published(client, topic_substr: str, **fields) -> dict:
+        client.publish.assert_called_once()
+        call = client.publish.call_args
+        assert topic_substr in call.args[0]
+        data = orjson.loads(call.kwargs["payload"] if "payload" in call.kwargs else call.args[1])
+        for key, value in fields.items():
+            assert data[key] == value
+        return data
+
+    return _assert_published
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the telemetry aggregator's per-tick hot paths.
+
+Tests:
+- create_telemetry_packet() throughput
+- _on_mqtt_message() decode + section rebuild for GPS and IMU batch messages
+- RotatingLogWriter.write_packets() for a batch of packets
+
+Requires pytest-benchmark (skipped otherwise). CI saves a baseline from main
+and fails when a median regresses by more than 10%. Locally:
+    pytest tests/integration/test_telemetry_benchmark.py --benchmark-only --benchmark-autosave
+    pytest tests/integration/test_telemetry_benchmark.py --benchmark-only --benchmark-compare --benchmark-compare-fail=median:10%
+"""
+
+import orjson
+import pytest
+from collections import namedtuple
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+pytest.importorskip("pytest_benchmark")
+
+import telemetry_service
+from sensors import imu_reader
+from telemetry_service import RotatingLogWriter, TelemetryAggregator
+
+
+# Incoming MQTT message as seen by on_message callbacks
+Msg = namedtuple("Msg", "topic payload")
+
+GPS_MSG = Msg(telemetry_service.GPS_TOPIC, orjson.dumps({
+    "device_id": "test-drone",
+    "type": "GGA",
+    "lat": 37.7749,
+    "lon": -122.4194,
+    "alt": 100.0
+}))
+
+# imu_reader publishes one batch per second at 50 Hz
+IMU_BATCH_SAMPLES = 50
+
+
+def _imu_batch_msg() -> Msg:
+    """Encode one batch of flat samples with the IMU reader's own publisher."""
+    published = []
+
+    class _Capture:
+        def publish(self, topic, payload=None, qos=0):
+            published.append(Msg(topic, payload))
+
+    samples = [
+        {"ts": 1_700_000_000.0 + i / IMU_BATCH_SAMPLES,
+         "ax": 0.1, "ay": -0.2, "az": 1.0,
+         "gx": 0.5, "gy": 0.3, "gz": 0.2, "p": 1.2, "r": -0.8}
+        for i in range(IMU_BATCH_SAMPLES)
+    ]
+    imu_reader.publish_mqtt_imu_batch(_Capture(), samples)
+    return published[0]
+
+
+IMU_MSG = _imu_batch_msg()
+
+
+@pytest.fixture(scope="module")
+def aggregator():
+    """Create one telemetry aggregator with simulated sensor data."""
+    aggregator = TelemetryAggregator(dry_run=True)
+    aggregator.setup_logging("WARNING")
+    aggregator.simulate_sensor_data()
+    yield aggregator
+    aggregator.log_writer.close()
+
+
+def test_create_telemetry_packet_bench(benchmark, aggregator):
+    """Benchmark building one telemetry packet from the latest sensor data."""
+    packet = benchmark(aggregator.create_telemetry_packet)
+    assert packet["gps"] is not None
+    assert packet["imu"] is not None
+
+
+@pytest.mark.parametrize("msg", [GPS_MSG, IMU_MSG], ids=["gps", "imu"])
+def test_on_mqtt_message_bench(benchmark, aggregator, msg):
+    """Benchmark handling one incoming sensor message."""
+    benchmark.pedantic(aggregator._on_mqtt_message, args=(None, None, msg), rounds=200, iterations=50)
+    assert aggregator.latest_gps is not None
+    assert aggregator.latest_imu is not None
+
+
+def test_imu_batch_keeps_newest_sample(aggregator):
+    """The benchmarked IMU message is a real batch; the newest sample wins."""
+    aggregator._on_mqtt_message(None, None, IMU_MSG)
+    assert aggregator.latest_imu["ts"] == 1_700_000_000.0 + (IMU_BATCH_SAMPLES - 1) / IMU_BATCH_SAMPLES
+    assert aggregator.latest_imu["est"]["pitch_deg"] == 1.2
+
+
+def test_write_packets_bench(benchmark, aggregator, tmp_path):
+    """Benchmark logging a batch of serialized packets."""
+    payload = orjson.dumps(aggregator.create_telemetry_packet())
+    writer = RotatingLogWriter(tmp_path / "telemetry.jsonl", max_packets=500, max_size_mb=1)
+    benchmark(writer.write_packets, [payload] * 100)
+    writer.close()
+    assert (tmp_path / "telemetry.jsonl").stat().st_size > 0
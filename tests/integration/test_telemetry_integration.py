@@ -6,30 +6,89 @@ Tests:
 - End-to-end telemetry flow (GPS + IMU → MQTT → Aggregator)
 - MQTT message format validation
 - Service integration and error recovery
-- Performance and reliability
+- Reliability (throughput is in test_telemetry_benchmark.py)
 """
 
-import json
+import orjson
 import pytest
 import time
 import threading
+from collections import defaultdict, namedtuple
+from dataclasses import dataclass, field
 from pathlib import Path
-from unittest.mock import Mock, patch
 import paho.mqtt.client as mqtt
 
 import sys
 sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
 
+import telemetry_service
 from telemetry_service import TelemetryAggregator
 
 
+# Incoming MQTT message as seen by on_message callbacks
+Msg = namedtuple("Msg", "topic payload")
+
+# Fixed sensor messages, serialized once for every test that replays them
+GPS_MESSAGE = {
+    "device_id": "test-drone",
+    "type": "GGA",
+    "lat": 37.7749,
+    "lon": -122.4194,
+    "alt": 100.0
+}
+
+IMU_MESSAGE = {
+    "ts": 1234567890.0,
+    "accel": {"x_g": 0.1, "y_g": -0.2, "z_g": 1.0},
+    "gyro": {"x_dps": 0.5, "y_dps": 0.3, "z_dps": 0.2},
+    "est": {"pitch_deg": 1.2, "roll_deg": -0.8}
+}
+
+GPS_PAYLOAD = orjson.dumps(GPS_MESSAGE)
+IMU_PAYLOAD = orjson.dumps(IMU_MESSAGE)
+
+
+class StubPublishResult:
+    """Stand-in for paho's MQTTMessageInfo; publishes complete immediately."""
+    
+    __slots__ = ()
+    rc = 0
+    
+    def is_published(self) -> bool:
+        return True
+    
+    def wait_for_publish(self, timeout=None) -> None:
+        return None
+
+
+# Stateless, so every stub publish returns the same instance
+PUBLISH_OK = StubPublishResult()
+
+
+@dataclass
+class StubMQTT:
+    """Minimal MQTT client stand-in that records publishes and subscriptions."""
+    
+    calls: list = field(default_factory=list)
+    subscriptions: list = field(default_factory=list)
+    
+    def publish(self, topic, payload=None, qos=0, retain=False):
+        self.calls.append((topic, payload, qos))
+        return PUBLISH_OK
+    
+    def subscribe(self, topic, qos=0):
+        self.subscriptions.append((topic, qos))
+        return (0, len(self.subscriptions))
+
+
 class MockMQTTBroker:
     """Mock MQTT broker for testing."""
     
     def __init__(self):
         self.clients = {}
         self.messages = []
-        self.subscriptions = {}
+        # topic -> subscribed clients, so a publish only visits its subscribers
+        self.topic_subs = defaultdict(set)
     
     def connect_client(self, client_id: str, client: mqtt.Client):
         """Connect a client to the mock broker."""
@@ -41,19 +100,35 @@ class MockMQTTBroker:
         """Publish a message to all subscribed clients."""
         self.messages.append((topic, payload, qos))
         
-        # Find subscribers
-        for client_id, client in self.clients.items():
-            if topic in self.subscriptions.get(client_id, []):
-                msg = Mock()
-                msg.topic = topic
-                msg.payload = payload.encode('utf-8')
-                client._on_message(client, None, msg)
+        subscribers = self.topic_subs.get(topic)
+        if not subscribers:
+            return
+        msg = Msg(topic, payload.encode('utf-8'))
+        for client in subscribers:
+            client._on_message(client, None, msg)
     
     def subscribe_client(self, client_id: str, topic: str):
         """Subscribe a client to a topic."""
-        if client_id not in self.subscriptions:
-            self.subscriptions[client_id] = []
-        self.subscriptions[client_id].append(topic)
+        self.topic_subs[topic].add(self.clients[client_id])
+
+
+@pytest.fixture(scope="class")
+def shared_aggregator():
+    """Create one telemetry aggregator per test class."""
+    aggregator = TelemetryAggregator(dry_run=False)
+    aggregator.setup_logging("WARNING")  # Reduce log noise
+    yield aggregator
+    aggregator.log_writer.close()
+
+
+@pytest.fixture
+def telemetry_aggregator(shared_aggregator):
+    """Hand each test the class's aggregator with per-test state reset."""
+    shared_aggregator.latest_gps = None
+    shared_aggregator.latest_imu = None
+    shared_aggregator.mqtt_client = None
+    shared_aggregator.killer._event.clear()
+    return shared_aggregator
 
 
 class TestTelemetryIntegration:
@@ -64,13 +139,6 @@ class TestTelemetryIntegration:
         """Create a mock MQTT broker."""
         return MockMQTTBroker()
     
-    @pytest.fixture
-    def telemetry_aggregator(self):
-        """Create a telemetry aggregator for testing."""
-        aggregator = TelemetryAggregator(dry_run=False)
-        aggregator.setup_logging("WARNING")  # Reduce log noise
-        return aggregator
-    
     def test_telemetry_packet_creation(self, telemetry_aggregator):
         """Test telemetry packet creation with sensor data."""
         # Set up mock sensor data
@@ -99,6 +167,7 @@ class TestTelemetryIntegration:
         assert packet["device_id"] == "pi-drone-01"
         assert "timestamp" in packet
         assert "timestamp_iso" in packet
+        assert "%f" not in packet["timestamp_iso"]
         assert "battery" in packet
         assert "camera" in packet
         assert "gps" in packet
@@ -137,22 +206,22 @@ class TestTelemetryIntegration:
         assert "battery" in packet
         assert "camera" in packet
     
-    def test_battery_estimation(self, telemetry_aggregator):
+    def test_battery_estimation(self, telemetry_aggregator, monkeypatch):
         """Test battery estimation over time."""
         # Get initial battery level
         initial_voltage, initial_percentage = telemetry_aggregator.estimate_battery()
         
         # Simulate time passing
-        with patch('time.time') as mock_time:
-            mock_time.return_value = time.time() + 3600  # 1 hour later
-            
-            # Get battery level after time
-            later_voltage, later_percentage = telemetry_aggregator.estimate_battery()
-            
-            # Battery should have discharged
-            assert later_voltage < initial_voltage
-            assert later_percentage < initial_percentage
-            assert later_percentage >= 0  # Should not go below 0%
+        later = time.monotonic() + 3600  # 1 hour later
+        monkeypatch.setattr(telemetry_service.time, "monotonic", lambda: later)
+        
+        # Get battery level after time
+        later_voltage, later_percentage = telemetry_aggregator.estimate_battery()
+        
+        # Battery should have discharged
+        assert later_voltage < initial_voltage
+        assert later_percentage < initial_percentage
+        assert later_percentage >= 0  # Should not go below 0%
     
     def test_camera_status(self, telemetry_aggregator):
         """Test camera status reporting."""
@@ -165,33 +234,14 @@ class TestTelemetryIntegration:
         assert isinstance(status["available"], bool)
         assert isinstance(status["recording"], bool)
     
-    @patch('telemetry_service.mqtt.Client')
-    def test_mqtt_message_handling(self, mock_mqtt_client, telemetry_aggregator):
+    def test_mqtt_message_handling(self, telemetry_aggregator):
         """Test MQTT message handling."""
-        # Mock MQTT client
-        mock_client = Mock()
+        # Stub MQTT client
+        mock_client = StubMQTT()
         telemetry_aggregator.mqtt_client = mock_client
         
-        # Create test messages
-        gps_message = {
-            "device_id": "test-drone",
-            "type": "GGA",
-            "lat": 37.7749,
-            "lon": -122.4194,
-            "alt": 100.0
-        }
-        
-        imu_message = {
-            "ts": 1234567890.0,
-            "accel": {"x_g": 0.1, "y_g": -0.2, "z_g": 1.0},
-            "gyro": {"x_dps": 0.5, "y_dps": 0.3, "z_dps": 0.2},
-            "est": {"pitch_deg": 1.2, "roll_deg": -0.8}
-        }
-        
         # Simulate GPS message
-        msg = Mock()
-        msg.topic = "drone/test-drone/gps"
-        msg.payload = json.dumps(gps_message).encode('utf-8')
+        msg = Msg(telemetry_service.GPS_TOPIC, GPS_PAYLOAD)
         telemetry_aggregator._on_mqtt_message(mock_client, None, msg)
         
         # Verify GPS data was stored
@@ -199,14 +249,53 @@ class TestTelemetryIntegration:
         assert telemetry_aggregator.latest_gps["lat"] == 37.7749
         
         # Simulate IMU message
-        msg.topic = "drone/test-drone/imu"
-        msg.payload = json.dumps(imu_message).encode('utf-8')
+        msg = Msg(telemetry_service.IMU_TOPIC, IMU_PAYLOAD)
         telemetry_aggregator._on_mqtt_message(mock_client, None, msg)
         
         # Verify IMU data was stored
         assert telemetry_aggregator.latest_imu is not None
         assert telemetry_aggregator.latest_imu["est"]["pitch_deg"] == 1.2
     
+    def test_mqtt_batched_flat_imu_message(self, telemetry_aggregator):
+        """Test batched flat IMU samples are expanded from the newest entry."""
+        batch = {
+            "device_id": "pi-drone-01",
+            "samples": [
+                {"ts": 1.0, "ax": 0.0, "ay": 0.0, "az": 1.0,
+                 "gx": 0.0, "gy": 0.0, "gz": 0.0, "p": 0.5, "r": 0.1},
+                {"ts": 2.0, "ax": 0.1, "ay": -0.2, "az": 1.0,
+                 "gx": 0.5, "gy": 0.3, "gz": 0.2, "p": 1.2, "r": -0.8},
+            ]
+        }
+        
+        msg = Msg("drone/pi-drone-01/imu", orjson.dumps(batch))
+        telemetry_aggregator._on_mqtt_message(StubMQTT(), None, msg)
+        
+        imu = telemetry_aggregator.latest_imu
+        assert imu["ts"] == 2.0
+        assert imu["accel"]["x_g"] == 0.1
+        assert imu["gyro"]["x_dps"] == 0.5
+        assert imu["est"]["pitch_deg"] == 1.2
+        assert imu["est"]["roll_deg"] == -0.8
+    
+    def test_mqtt_msgpack_imu_message(self, telemetry_aggregator):
+        """Test MessagePack IMU batches on the imu/mpk topic are decoded."""
+        import msgpack
+        
+        batch = {
+            "device_id": "pi-drone-01",
+            "samples": [
+                {"ts": 3.0, "ax": 0.1, "ay": -0.2, "az": 1.0,
+                 "gx": 0.5, "gy": 0.3, "gz": 0.2, "p": 2.5, "r": -1.5},
+            ]
+        }
+        
+        msg = Msg("drone/pi-drone-01/imu/mpk", msgpack.packb(batch))
+        telemetry_aggregator._on_mqtt_message(StubMQTT(), None, msg)
+        
+        assert telemetry_aggregator.latest_imu["ts"] == 3.0
+        assert telemetry_aggregator.latest_imu["est"]["pitch_deg"] == 2.5
+    
     def test_dry_run_mode(self):
         """Test telemetry aggregator in dry-run mode."""
         aggregator = TelemetryAggregator(dry_run=True)
@@ -226,13 +315,23 @@ class TestTelemetryIntegration:
         assert "lat" in aggregator.latest_gps
         assert "est" in aggregator.latest_imu
     
+    def test_main_stops_logging_on_fatal_error(self, monkeypatch):
+        """Test the log listener is stopped when run() fails."""
+        stopped = []
+        def fail(self):
+            raise RuntimeError("broker unreachable")
+        monkeypatch.setattr(TelemetryAggregator, "run", fail)
+        monkeypatch.setattr(TelemetryAggregator, "stop_logging", lambda self: stopped.append(self))
+        monkeypatch.setattr(sys, "argv", ["telemetry_service", "--log-level", "WARNING"])
+        
+        with pytest.raises(SystemExit):
+            telemetry_service.main()
+        assert len(stopped) == 1
+    
     def test_telemetry_publishing(self, telemetry_aggregator):
         """Test telemetry packet publishing."""
-        # Mock MQTT client
-        mock_client = Mock()
-        mock_result = Mock()
-        mock_result.wait_for_publish.return_value = None
-        mock_client.publish.return_value = mock_result
+        # Stub MQTT client
+        mock_client = StubMQTT()
         telemetry_aggregator.mqtt_client = mock_client
         
         # Create test packet
@@ -245,15 +344,16 @@ class TestTelemetryIntegration:
         }
         
         # Publish packet
-        telemetry_aggregator.publish_telemetry(packet)
+        telemetry_aggregator.publish_telemetry(orjson.dumps(packet))
         
         # Verify MQTT publish was called
-        mock_client.publish.assert_called_once()
-        call_args = mock_client.publish.call_args
+        assert len(mock_client.calls) == 1
+        topic, payload, qos = mock_client.calls[0]
         
         # Check topic and payload
-        assert "drone/pi-drone-01/telemetry" in call_args[0][0]
-        published_packet = json.loads(call_args[0][1])
+        assert "drone/pi-drone-01/telemetry" in topic
+        assert qos == 1
+        published_packet = orjson.loads(payload)
         assert published_packet["device_id"] == "test-drone"
         assert published_packet["battery"]["percentage"] == 85.0
 
@@ -261,25 +361,6 @@ class TestTelemetryIntegration:
 class TestPerformanceAndReliability:
     """Test performance and reliability aspects."""
     
-    def test_telemetry_rate_limiting(self):
-        """Test telemetry rate limiting."""
-        aggregator = TelemetryAggregator(dry_run=True)
-        aggregator.setup_logging("WARNING")
-        
-        # Set up sensor data
-        aggregator.simulate_sensor_data()
-        
-        # Create multiple packets quickly
-        packets = []
-        for _ in range(10):
-            packet = aggregator.create_telemetry_packet()
-            packets.append(packet)
-            time.sleep(0.01)  # Small delay
-        
-        # All packets should have valid timestamps
-        timestamps = [p["timestamp"] for p in packets]
-        assert len(set(timestamps)) == len(timestamps)  # All unique
-    
     def test_error_recovery(self, telemetry_aggregator):
         """Test error recovery mechanisms."""
         # Test with invalid sensor data
@@ -289,21 +370,28 @@ class TestPerformanceAndReliability:
         # Should not crash
         packet = telemetry_aggregator.create_telemetry_packet()
         assert packet is not None
-        assert packet["gps"] is None  # Should handle invalid data gracefully
+        # A fix without a position still yields a GPS section, with no position
+        assert packet["gps"]["lat"] is None
+        assert packet["gps"]["lon"] is None
+        assert packet["imu"] is None
     
-    def test_memory_usage(self):
-        """Test memory usage with large number of packets."""
-        aggregator = TelemetryAggregator(dry_run=True)
-        aggregator.setup_logging("WARNING")
+    def test_iso_timestamp_format(self, telemetry_aggregator):
+        """Test cached ISO timestamps carry milliseconds and track the second."""
+        assert telemetry_aggregator._iso(1234567890.25) == "2009-02-13T23:31:30.250Z"
+        assert telemetry_aggregator._iso(1234567890.999) == "2009-02-13T23:31:30.999Z"
+        assert telemetry_aggregator._iso(1234567891.0) == "2009-02-13T23:31:31.000Z"
+    
+    def test_killer_wait_wakes_on_signal(self, telemetry_aggregator):
+        """Test the loop's deadline sleep returns as soon as shutdown is requested."""
+        killer = telemetry_aggregator.killer
+        assert killer.wait(0.01) is False
         
-        # Create many packets
-        for _ in range(1000):
-            aggregator.simulate_sensor_data()
-            packet = aggregator.create_telemetry_packet()
-            aggregator.log_writer.write_packet(packet)
+        killer._on_signal(15, None)
         
-        # Should not exceed buffer limits
-        assert len(aggregator.log_writer.packet_buffer) <= 500  # MAX_LOG_PACKETS
+        start = time.monotonic()
+        assert killer.wait(5.0) is True
+        assert time.monotonic() - start < 1.0
+        assert killer.should_stop
 
 
 if __name__ == "__main__":
@@ -11,21 +11,29 @@ Tests:
 - MQTT message handling
 """
 
-import json
+import orjson
 import pytest
-import tempfile
-import time
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
 
+import paho.mqtt.client as mqtt
 import sys
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
 from mission_runner import (
     MissionRunner, Mission, Waypoint, MissionState, MissionStatus,
-    GracefulKiller
+    _decode_mission, _IDLE_MISSION_FIELDS, _IDLE_MISSION_SECTION
 )
 
+# First two waypoints of the sample mission as (lat, lon, alt), and their midpoint
+POS_SF = (37.7749, -122.4194, 0.0)
+POS_SF2 = (37.7750, -122.4195, 50.0)
+MID_SF = tuple((a + b) / 2 for a, b in zip(POS_SF, POS_SF2))
+
+# Fixed wall-clock time for status timing checks
+FIXED_NOW = 1_700_000_000.0
+
 
 class TestWaypoint:
     """Test Waypoint dataclass."""
@@ -98,50 +106,89 @@ class TestMission:
         assert mission.default_altitude == 50.0
 
 
+@pytest.fixture(scope="session")
+def sample_mission_data():
+    """Sample mission data for testing."""
+    return {
+        "mission_id": "test_mission_001",
+        "name": "Test Mission",
+        "default_altitude": 50.0,
+        "max_speed": 5.0,
+        "payload_metadata": {"type": "test"},
+        "waypoints": [
+            {
+                "lat": 37.7749,
+                "lon": -122.4194,
+                "alt": 0.0,
+                "hold_seconds": 0.0,
+                "action": "none"
+            },
+            {
+                "lat": 37.7750,
+                "lon": -122.4195,
+                "alt": 50.0,
+                "hold_seconds": 5.0,
+                "action": "deliver"
+            },
+            {
+                "lat": 37.7749,
+                "lon": -122.4194,
+                "alt": 0.0,
+                "hold_seconds": 0.0,
+                "action": "land"
+            }
+        ]
+    }
+
+
+@pytest.fixture(scope="session")
+def mission_json_path(tmp_path_factory, sample_mission_data):
+    """Sample mission written to disk once per session."""
+    path = tmp_path_factory.mktemp("missions") / "test_mission_001.json"
+    path.write_bytes(orjson.dumps(sample_mission_data))
+    return path
+
+
+@pytest.fixture(scope="session")
+def loaded_mission(mission_json_path):
+    """Sample mission parsed once per session; the runner never mutates it."""
+    return MissionRunner(dry_run=True).load_mission(mission_json_path)
+
+
+@pytest.fixture(scope="module")
+def shared_mission_runner():
+    """Create one mission runner (and its logging setup) per module."""
+    runner = MissionRunner(dry_run=True)
+    runner.setup_logging("WARNING")  # Reduce log noise during tests
+    return runner
+
+
+@pytest.fixture
+def mission_runner(shared_mission_runner):
+    """Hand each test the shared runner with the state __init__ sets restored."""
+    runner = shared_mission_runner
+    runner.current_mission = None
+    runner.mission_status = None
+    runner.current_waypoint_index = 0
+    runner.mission_start_time = 0.0
+    runner.waypoint_start_time = 0.0
+    runner.hold_start_time = 0.0
+    runner.current_position = (0.0, 0.0, 0.0)
+    runner.target_position = (0.0, 0.0, 0.0)
+    runner.speed = 5.0  # DEFAULT_SPEED
+    runner.obstacle_detected = False
+    runner.obstacle_position = None
+    runner.original_waypoint_index = 0
+    runner.mqtt_client = None
+    runner._mission_fields = _IDLE_MISSION_FIELDS
+    runner._mission_sub = _IDLE_MISSION_SECTION
+    runner.state = MissionState.IDLE
+    return runner
+
+
 class TestMissionRunner:
     """Test MissionRunner class."""
     
-    @pytest.fixture
-    def sample_mission_data(self):
-        """Sample mission data for testing."""
-        return {
-            "mission_id": "test_mission_001",
-            "name": "Test Mission",
-            "default_altitude": 50.0,
-            "max_speed": 5.0,
-            "payload_metadata": {"type": "test"},
-            "waypoints": [
-                {
-                    "lat": 37.7749,
-                    "lon": -122.4194,
-                    "alt": 0.0,
-                    "hold_seconds": 0.0,
-                    "action": "none"
-                },
-                {
-                    "lat": 37.7750,
-                    "lon": -122.4195,
-                    "alt": 50.0,
-                    "hold_seconds": 5.0,
-                    "action": "deliver"
-                },
-                {
-                    "lat": 37.7749,
-                    "lon": -122.4194,
-                    "alt": 0.0,
-                    "hold_seconds": 0.0,
-                    "action": "land"
-                }
-            ]
-        }
-    
-    @pytest.fixture
-    def mission_runner(self):
-        """Create a mission runner instance for testing."""
-        runner = MissionRunner(dry_run=True)
-        runner.setup_logging("WARNING")  # Reduce log noise during tests
-        return runner
-    
     def test_mission_runner_initialization(self, mission_runner):
         """Test mission runner initialization."""
         assert mission_runner.dry_run is True
@@ -150,270 +197,197 @@ class TestMissionRunner:
         assert mission_runner.current_waypoint_index == 0
         assert mission_runner.speed == 5.0  # DEFAULT_SPEED
     
-    def test_load_mission(self, mission_runner, sample_mission_data):
+    def test_load_mission(self, mission_runner, mission_json_path):
         """Test mission loading from JSON data."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(sample_mission_data, f)
-            temp_path = Path(f.name)
-        
-        try:
-            mission = mission_runner.load_mission(temp_path)
-            
-            assert mission.mission_id == "test_mission_001"
-            assert mission.name == "Test Mission"
-            assert len(mission.waypoints) == 3
-            assert mission.max_speed == 5.0
-            assert mission.default_altitude == 50.0
-            
-            # Check first waypoint
-            wp1 = mission.waypoints[0]
-            assert wp1.lat == 37.7749
-            assert wp1.lon == -122.4194
-            assert wp1.alt == 0.0
-            assert wp1.action == "none"
-            
-            # Check second waypoint
-            wp2 = mission.waypoints[1]
-            assert wp2.lat == 37.7750
-            assert wp2.lon == -122.4195
-            assert wp2.alt == 50.0
-            assert wp2.hold_seconds == 5.0
-            assert wp2.action == "deliver"
-            
-        finally:
-            temp_path.unlink()
+        mission = mission_runner.load_mission(mission_json_path)
+        
+        assert mission.mission_id == "test_mission_001"
+        assert mission.name == "Test Mission"
+        assert len(mission.waypoints) == 3
+        assert mission.max_speed == 5.0
+        assert mission.default_altitude == 50.0
+        
+        # Check first waypoint
+        wp1 = mission.waypoints[0]
+        assert (wp1.lat, wp1.lon, wp1.alt) == POS_SF
+        assert wp1.action == "none"
+        
+        # Check second waypoint
+        wp2 = mission.waypoints[1]
+        assert (wp2.lat, wp2.lon, wp2.alt) == POS_SF2
+        assert wp2.hold_seconds == 5.0
+        assert wp2.action == "deliver"
+    
+    def test_load_mission_cached(self, mission_runner, mission_json_path, tmp_path):
+        """Test reloading an unchanged mission file reuses the decoded mission."""
+        _decode_mission.cache_clear()
+        mission = mission_runner.load_mission(mission_json_path)
+        
+        # Each load gets its own Mission; mutating one leaves later loads intact
+        mission.waypoints[1].metadata["visited"] = True
+        mission.payload_metadata["type"] = "edited"
+        mission.waypoints.pop()
+        reloaded = mission_runner.load_mission(mission_json_path)
+        assert reloaded is not mission
+        assert reloaded.waypoints[1].metadata == {}
+        assert reloaded.payload_metadata == {"type": "test"}
+        assert len(reloaded.waypoints) == 3
+        assert _decode_mission.cache_info().hits == 1
+        
+        # Same contents under another path hit the cache; edited contents do not
+        copy_path = tmp_path / "copy.json"
+        copy_path.write_bytes(mission_json_path.read_bytes())
+        mission_runner.load_mission(copy_path)
+        assert _decode_mission.cache_info().hits == 2
+        copy_path.write_bytes(mission_json_path.read_bytes().replace(b"Test Mission", b"Edited Mission"))
+        assert mission_runner.load_mission(copy_path).name == "Edited Mission"
     
     def test_load_mission_missing_file(self, mission_runner):
         """Test mission loading with missing file."""
         with pytest.raises(Exception):
             mission_runner.load_mission(Path("nonexistent.json"))
     
-    def test_load_mission_invalid_json(self, mission_runner):
+    def test_load_mission_invalid_json(self, mission_runner, tmp_path):
         """Test mission loading with invalid JSON."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            f.write("invalid json content")
-            temp_path = Path(f.name)
-        
-        try:
-            with pytest.raises(Exception):
-                mission_runner.load_mission(temp_path)
-        finally:
-            temp_path.unlink()
+        temp_path = tmp_path / "mission.json"
+        temp_path.write_bytes(b"invalid json content")
+        
+        with pytest.raises(Exception):
+            mission_runner.load_mission(temp_path)
     
     def test_calculate_distance(self, mission_runner):
         """Test distance calculation between positions."""
-        pos1 = (37.7749, -122.4194, 0.0)
-        pos2 = (37.7750, -122.4195, 50.0)
+        distance = mission_runner._calculate_distance(POS_SF, POS_SF2)
         
-        distance = mission_runner._calculate_distance(pos1, pos2)
+        # ~11.1 m north, ~8.8 m west and 50 m up
+        assert distance == pytest.approx(52.0, abs=0.5)
+    
+    @pytest.mark.parametrize("lat,expected", [(0.0, 111.32), (60.0, 55.66)])
+    def test_calculate_distance_east_west(self, mission_runner, lat, expected):
+        """Test a degree of longitude shrinks with cos(latitude)."""
+        distance = mission_runner._calculate_distance((lat, 10.0, 0.0), (lat, 10.001, 0.0))
         
-        # Should be approximately 111 meters (rough calculation)
-        assert distance > 100
-        assert distance < 150
+        assert distance == pytest.approx(expected, rel=1e-3)
     
     def test_interpolate_position(self, mission_runner):
         """Test position interpolation."""
-        start = (37.7749, -122.4194, 0.0)
-        end = (37.7750, -122.4195, 50.0)
-        
         # Test 0% progress
-        pos_0 = mission_runner._interpolate_position(start, end, 0.0)
-        assert pos_0 == start
+        pos_0 = mission_runner._interpolate_position(POS_SF, POS_SF2, 0.0)
+        assert pos_0 == POS_SF
         
         # Test 100% progress
-        pos_1 = mission_runner._interpolate_position(start, end, 1.0)
-        assert pos_1 == end
+        pos_1 = mission_runner._interpolate_position(POS_SF, POS_SF2, 1.0)
+        assert pos_1 == POS_SF2
         
         # Test 50% progress
-        pos_05 = mission_runner._interpolate_position(start, end, 0.5)
-        assert pos_05[0] == (start[0] + end[0]) / 2
-        assert pos_05[1] == (start[1] + end[1]) / 2
-        assert pos_05[2] == (start[2] + end[2]) / 2
+        pos_05 = mission_runner._interpolate_position(POS_SF, POS_SF2, 0.5)
+        assert pos_05 == MID_SF
     
-    def test_start_mission(self, mission_runner, sample_mission_data):
+    def test_start_mission(self, mission_runner, loaded_mission):
         """Test mission start functionality."""
-        # Create mission
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(sample_mission_data, f)
-            temp_path = Path(f.name)
-        
-        try:
-            mission = mission_runner.load_mission(temp_path)
-            mission_runner.current_mission = mission
-            
-            # Start mission
-            mission_runner._start_mission()
-            
-            assert mission_runner.state == MissionState.TAKEOFF
-            assert mission_runner.current_waypoint_index == 0
-            assert mission_runner.mission_start_time > 0
-            assert mission_runner.speed == 5.0
-            
-            # Check initial position
-            expected_pos = (37.7749, -122.4194, 0.0)
-            assert mission_runner.current_position == expected_pos
-            
-        finally:
-            temp_path.unlink()
+        # Use the shared mission
+        mission_runner.current_mission = loaded_mission
+        
+        # Start mission
+        mission_runner._start_mission()
+        
+        assert mission_runner.state == MissionState.TAKEOFF
+        assert mission_runner.current_waypoint_index == 0
+        assert mission_runner.mission_start_time > 0
+        assert mission_runner.speed == 5.0
+        
+        # Check initial position
+        assert mission_runner.current_position == POS_SF
     
-    def test_pause_resume_mission(self, mission_runner, sample_mission_data):
+    def test_pause_resume_mission(self, mission_runner, loaded_mission):
         """Test mission pause and resume functionality."""
-        # Create and start mission
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(sample_mission_data, f)
-            temp_path = Path(f.name)
-        
-        try:
-            mission = mission_runner.load_mission(temp_path)
-            mission_runner.current_mission = mission
-            mission_runner._start_mission()
-            
-            # Set to ENROUTE state
-            mission_runner.state = MissionState.ENROUTE
-            
-            # Pause mission
-            mission_runner._pause_mission()
-            assert mission_runner.state == MissionState.PAUSED
-            
-            # Resume mission
-            mission_runner._resume_mission()
-            assert mission_runner.state == MissionState.ENROUTE
-            
-        finally:
-            temp_path.unlink()
+        # Start the shared mission
+        mission_runner.current_mission = loaded_mission
+        mission_runner._start_mission()
+        
+        # Set to ENROUTE state
+        mission_runner.state = MissionState.ENROUTE
+        
+        # Pause mission
+        mission_runner._pause_mission()
+        assert mission_runner.state == MissionState.PAUSED
+        
+        # Resume mission
+        mission_runner._resume_mission()
+        assert mission_runner.state == MissionState.ENROUTE
     
-    def test_abort_mission(self, mission_runner, sample_mission_data):
+    def test_abort_mission(self, mission_runner, loaded_mission):
         """Test mission abort functionality."""
-        # Create and start mission
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(sample_mission_data, f)
-            temp_path = Path(f.name)
-        
-        try:
-            mission = mission_runner.load_mission(temp_path)
-            mission_runner.current_mission = mission
-            mission_runner._start_mission()
-            
-            # Abort mission
-            mission_runner._abort_mission()
-            assert mission_runner.state == MissionState.ERROR
-            assert mission_runner.mission_status.error_message == "Mission aborted by command"
-            
-        finally:
-            temp_path.unlink()
+        # Start the shared mission
+        mission_runner.current_mission = loaded_mission
+        mission_runner._start_mission()
+        
+        # Abort mission
+        mission_runner._abort_mission()
+        assert mission_runner.state == MissionState.ERROR
+        assert mission_runner.mission_status.error_message == "Mission aborted by command"
     
-    def test_advance_to_next_waypoint(self, mission_runner, sample_mission_data):
-        """Test waypoint advancement logic."""
-        # Create mission
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(sample_mission_data, f)
-            temp_path = Path(f.name)
-        
-        try:
-            mission = mission_runner.load_mission(temp_path)
-            mission_runner.current_mission = mission
-            mission_runner.current_waypoint_index = 0
-            
-            # Advance to next waypoint
-            mission_runner._advance_to_next_waypoint()
-            assert mission_runner.current_waypoint_index == 1
-            assert mission_runner.state == MissionState.ENROUTE
-            
-            # Advance to last waypoint
-            mission_runner.current_waypoint_index = 2
-            mission_runner._advance_to_next_waypoint()
-            assert mission_runner.current_waypoint_index == 3  # Beyond waypoints
-            assert mission_runner.state == MissionState.RETURN
-            
-        finally:
-            temp_path.unlink()
-    
-    def test_execute_delivery_action(self, mission_runner):
-        """Test delivery action execution."""
-        waypoint = Waypoint(
-            lat=37.7750,
-            lon=-122.4195,
-            alt=50.0,
-            action="deliver",
-            metadata={"drop_zone_id": "test_zone"}
-        )
-        
-        # Mock MQTT client
-        mission_runner.mqtt_client = Mock()
-        mission_runner.current_mission = Mock()
-        mission_runner.current_mission.mission_id = "test_001"
-        mission_runner.current_mission.payload_metadata = {"type": "test"}
-        mission_runner.current_waypoint_index = 1
+    def test_load_and_start_mission_failure(self, mission_runner):
+        """Test a failed mission start before any status exists sets ERROR."""
+        with patch.object(mission_runner, "load_mission", side_effect=ValueError("bad mission")):
+            mission_runner._load_and_start_mission("missing")
         
-        # Execute delivery
-        mission_runner._execute_delivery_action(waypoint)
+        assert mission_runner.state == MissionState.ERROR
+        assert mission_runner.mission_status is None
+    
+    def test_advance_to_next_waypoint(self, mission_runner, loaded_mission):
+        """Test waypoint advancement logic."""
+        # Use the shared mission
+        mission_runner.current_mission = loaded_mission
+        mission_runner.current_waypoint_index = 0
         
-        # Verify servo command was published
-        mission_runner.mqtt_client.publish.assert_called_once()
-        call_args = mission_runner.mqtt_client.publish.call_args
-        assert call_args[0][0] == "drone/pi-drone-01/servo/command"
+        # Advance to next waypoint
+        mission_runner._advance_to_next_waypoint()
+        assert mission_runner.current_waypoint_index == 1
+        assert mission_runner.state == MissionState.ENROUTE
         
-        # Verify command content
-        command_data = json.loads(call_args[0][1])
-        assert command_data["command"] == "release"
-        assert command_data["waypoint"] == 1
+        # Advance to last waypoint
+        mission_runner.current_waypoint_index = 2
+        mission_runner._advance_to_next_waypoint()
+        assert mission_runner.current_waypoint_index == 3  # Beyond waypoints
+        assert mission_runner.state == MissionState.RETURN
     
-    def test_execute_photo_action(self, mission_runner):
-        """Test photo action execution."""
-        waypoint = Waypoint(
-            lat=37.7750,
-            lon=-122.4195,
-            alt=50.0,
-            action="photo",
-            metadata={"photo_count": 5}
-        )
+    @pytest.mark.parametrize("action,metadata,expect_publish", [
+        ("deliver", {"drop_zone_id": "test_zone"}, True),
+        ("photo", {"photo_count": 5}, False),
+        ("land", {}, False),
+        ("none", {}, False),
+    ])
+    def test_execute_action(self, mission_runner, assert_published, action, metadata, expect_publish):
+        """Test waypoint action execution; only deliver sends a servo command."""
+        waypoint = Waypoint(*POS_SF2, action=action, metadata=metadata)
         
-        mission_runner.current_position = (37.7750, -122.4195, 50.0)
-        mission_runner.current_mission = Mock()
-        mission_runner.current_mission.mission_id = "test_001"
+        # Mock MQTT client
+        mission_runner.mqtt_client = Mock(spec=mqtt.Client)
+        mission_runner.current_position = POS_SF2
+        mission_runner.current_mission = SimpleNamespace(mission_id="test_001", payload_metadata={"type": "test"})
         mission_runner.current_waypoint_index = 1
         
-        # Execute photo action (should not raise exception)
         mission_runner._execute_delivery_action(waypoint)
+        
+        if expect_publish:
+            assert_published(mission_runner.mqtt_client, "drone/pi-drone-01/servo/command", command="release", waypoint=1)
+        else:
+            mission_runner.mqtt_client.publish.assert_not_called()
     
-    @patch('mission_runner.mqtt.Client')
-    def test_handle_mission_command(self, mock_mqtt_client, mission_runner):
+    @pytest.mark.parametrize("command,state,method,args", [
+        ({"type": "start", "mission_id": "test_mission"}, MissionState.IDLE, "_load_and_start_mission", ("test_mission",)),
+        ({"type": "pause"}, MissionState.ENROUTE, "_pause_mission", ()),
+        ({"type": "resume"}, MissionState.PAUSED, "_resume_mission", ()),
+        ({"type": "abort"}, MissionState.ENROUTE, "_abort_mission", ()),
+    ], ids=["start", "pause", "resume", "abort"])
+    def test_handle_mission_command(self, mission_runner, command, state, method, args):
         """Test MQTT mission command handling."""
-        # Mock MQTT client
-        mission_runner.mqtt_client = Mock()
-        
-        # Test start command
-        start_command = {
-            "type": "start",
-            "mission_id": "test_mission"
-        }
-        
-        with patch.object(mission_runner, '_load_and_start_mission') as mock_load:
-            mission_runner._handle_mission_command(start_command)
-            mock_load.assert_called_once_with("test_mission")
-        
-        # Test pause command
-        mission_runner.state = MissionState.ENROUTE
-        pause_command = {"type": "pause"}
+        mission_runner.state = state
         
-        with patch.object(mission_runner, '_pause_mission') as mock_pause:
-            mission_runner._handle_mission_command(pause_command)
-            mock_pause.assert_called_once()
-        
-        # Test resume command
-        mission_runner.state = MissionState.PAUSED
-        resume_command = {"type": "resume"}
-        
-        with patch.object(mission_runner, '_resume_mission') as mock_resume:
-            mission_runner._handle_mission_command(resume_command)
-            mock_resume.assert_called_once()
-        
-        # Test abort command
-        abort_command = {"type": "abort"}
-        
-        with patch.object(mission_runner, '_abort_mission') as mock_abort:
-            mission_runner._handle_mission_command(abort_command)
-            mock_abort.assert_called_once()
+        with patch.object(mission_runner, method) as mock_handler:
+            mission_runner._handle_mission_command(command)
+            mock_handler.assert_called_once_with(*args)
     
     def test_handle_obstacle_detection(self, mission_runner):
         """Test obstacle detection handling."""
@@ -450,93 +424,98 @@ class TestMissionRunner:
         assert mission_runner.obstacle_detected is False
         assert mission_runner.state == MissionState.ENROUTE
     
-    def test_publish_mission_status(self, mission_runner, sample_mission_data):
+    def test_publish_mission_status(self, mission_runner, loaded_mission, assert_published):
         """Test mission status publishing."""
-        # Create mission
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(sample_mission_data, f)
-            temp_path = Path(f.name)
-        
-        try:
-            mission = mission_runner.load_mission(temp_path)
-            mission_runner.current_mission = mission
-            mission_runner.state = MissionState.ENROUTE
-            mission_runner.current_waypoint_index = 1
-            mission_runner.current_position = (37.7750, -122.4195, 50.0)
-            mission_runner.target_position = (37.7750, -122.4195, 50.0)
-            mission_runner.speed = 5.0
-            mission_runner.mission_start_time = time.time()
-            
-            # Mock MQTT client
-            mission_runner.mqtt_client = Mock()
-            
-            # Publish status
+        # Use the shared mission
+        mission_runner.current_mission = loaded_mission
+        mission_runner.state = MissionState.ENROUTE
+        mission_runner.current_waypoint_index = 1
+        mission_runner.current_position = (37.7750, -122.4195, 50.0)
+        mission_runner.target_position = (37.7750, -122.4195, 50.0)
+        mission_runner.speed = 5.0
+        mission_runner.mission_start_time = FIXED_NOW - 60.0  # One minute in
+        
+        # Mock MQTT client
+        mission_runner.mqtt_client = Mock(spec=mqtt.Client)
+        
+        # Publish status at a fixed wall-clock time
+        with patch("mission_runner.time.time", return_value=FIXED_NOW):
             mission_runner._publish_mission_status()
-            
-            # Verify MQTT publish was called
-            mission_runner.mqtt_client.publish.assert_called_once()
-            call_args = mission_runner.mqtt_client.publish.call_args
-            assert call_args[0][0] == "drone/pi-drone-01/mission/status"
-            
-            # Verify status content
-            status_data = json.loads(call_args[0][1])
-            assert status_data["mission_id"] == "test_mission_001"
-            assert status_data["state"] == "ENROUTE"
-            assert status_data["current_waypoint"] == 1
-            assert status_data["total_waypoints"] == 3
-            assert "progress_percent" in status_data
-            assert "estimated_time_remaining" in status_data
-            
-        finally:
-            temp_path.unlink()
+        
+        # Verify status was published
+        status_data = assert_published(
+            mission_runner.mqtt_client, "drone/pi-drone-01/mission/status",
+            mission_id="test_mission_001", state="ENROUTE", current_waypoint=1, total_waypoints=3
+        )
+        # 1 of 3 waypoints done after 60s -> 120s to go
+        assert status_data["progress_percent"] == pytest.approx(100 / 3)
+        assert status_data["estimated_time_remaining"] == pytest.approx(120.0)
+        assert status_data["timestamp"] == FIXED_NOW
+    
+    def test_run_loop_publish_topics(self, mission_runner, loaded_mission, monkeypatch):
+        """Test the run loop keeps status and telemetry on their own topics."""
+        client = Mock(spec=mqtt.Client)
+        monkeypatch.setattr(mission_runner, "build_mqtt_client", lambda: client)
+        monkeypatch.setattr(mission_runner, "killer", SimpleNamespace(should_stop=False))
+        mission_runner.current_mission = loaded_mission
+        
+        # Fake clock: every loop sleep advances 0.25s; stop after 3.5s
+        clock = [FIXED_NOW]
+        
+        def fake_sleep(_seconds):
+            clock[0] += 0.25
+            if clock[0] >= FIXED_NOW + 3.5:
+                mission_runner.killer.should_stop = True
+        
+        monkeypatch.setattr("mission_runner.time.time", lambda: clock[0])
+        monkeypatch.setattr("mission_runner.time.sleep", fake_sleep)
+        
+        mission_runner.run()
+        
+        # Telemetry every second, status every other second
+        status, telemetry = "drone/pi-drone-01/mission/status", "drone/pi-drone-01/telemetry"
+        topics = [call.args[0] for call in client.publish.call_args_list]
+        assert topics == [status, telemetry, telemetry, status, telemetry, telemetry]
     
-    def test_publish_simulated_telemetry(self, mission_runner):
+    def test_publish_simulated_telemetry(self, mission_runner, assert_published):
         """Test simulated telemetry publishing."""
         mission_runner.current_position = (37.7750, -122.4195, 50.0)
-        mission_runner.current_mission = Mock()
-        mission_runner.current_mission.mission_id = "test_001"
+        mission_runner.current_mission = SimpleNamespace(mission_id="test_001")
         mission_runner.state = MissionState.ENROUTE
         mission_runner.current_waypoint_index = 1
-        mission_runner.mission_status = Mock()
-        mission_runner.mission_status.progress_percent = 33.3
+        mission_runner.mission_status = SimpleNamespace(progress_percent=33.3)
         
         # Mock MQTT client
-        mission_runner.mqtt_client = Mock()
+        mission_runner.mqtt_client = Mock(spec=mqtt.Client)
         
         # Publish telemetry
         mission_runner._publish_simulated_telemetry()
         
-        # Verify MQTT publish was called
-        mission_runner.mqtt_client.publish.assert_called_once()
-        call_args = mission_runner.mqtt_client.publish.call_args
-        assert call_args[0][0] == "drone/pi-drone-01/telemetry"
-        
-        # Verify telemetry content
-        telemetry_data = json.loads(call_args[0][1])
-        assert telemetry_data["device_id"] == "pi-drone-01"
+        # Verify telemetry was published
+        telemetry_data = assert_published(mission_runner.mqtt_client, "drone/pi-drone-01/telemetry", device_id="pi-drone-01")
         assert telemetry_data["gps"]["lat"] == 37.7750
         assert telemetry_data["gps"]["lon"] == -122.4195
         assert telemetry_data["gps"]["alt"] == 50.0
         assert telemetry_data["mission"]["mission_id"] == "test_001"
         assert telemetry_data["mission"]["state"] == "ENROUTE"
         assert telemetry_data["mission"]["waypoint"] == 1
-
-
-class TestGracefulKiller:
-    """Test GracefulKiller class."""
-    
-    def test_graceful_killer_initialization(self):
-        """Test graceful killer initialization."""
-        killer = GracefulKiller()
-        assert killer.should_stop is False
     
-    def test_graceful_killer_signal_handling(self):
-        """Test graceful killer signal handling."""
-        killer = GracefulKiller()
+    def test_simulated_telemetry_mission_section(self, mission_runner):
+        """Test the mission section is rebuilt only when the mission state changes."""
+        idle = mission_runner._build_simulated_telemetry()
+        assert idle["mission"] is _IDLE_MISSION_SECTION
         
-        # Simulate signal
-        killer._on_signal(signal.SIGINT, None)
-        assert killer.should_stop is True
+        mission_runner.current_mission = SimpleNamespace(mission_id="test_001")
+        mission_runner.state = MissionState.ENROUTE
+        enroute = mission_runner._build_simulated_telemetry()
+        assert mission_runner._build_simulated_telemetry()["mission"] is enroute["mission"]
+        
+        # Earlier packets keep the section they were built with
+        mission_runner.current_waypoint_index = 1
+        later = mission_runner._build_simulated_telemetry()
+        assert enroute["mission"] == {"mission_id": "test_001", "state": "ENROUTE", "waypoint": 0, "progress_percent": 0}
+        assert later["mission"]["waypoint"] == 1
+        assert idle["mission"] == {"mission_id": None, "state": "IDLE", "waypoint": 0, "progress_percent": 0}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the services' GracefulKiller classes.
+
+Tests:
+- Stop flag is clear on construction
+- Stop flag is set once the signal handler runs
+"""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
+
+from mission_runner import GracefulKiller as MissionKiller
+from telemetry_service import GracefulKiller as TelemetryKiller
+from sensors.gps_reader import GracefulKiller as GPSKiller
+from sensors.imu_reader import GracefulKiller as IMUKiller
+
+
+@pytest.mark.parametrize("killer_cls,flag,handler", [
+    (MissionKiller, "should_stop", "_on_signal"),
+    (TelemetryKiller, "should_stop", "_on_signal"),
+    (GPSKiller, "should_stop", "_on_signal"),
+    (IMUKiller, "stop", "_on"),
+], ids=["mission", "telemetry", "gps", "imu"])
+def test_graceful_killer(killer_cls, flag, handler):
+    """Test graceful killer signal handling."""
+    killer = killer_cls()
+
+    # Initially should not stop
+    assert getattr(killer, flag) is False
+
+    # Simulate signal
+    getattr(killer, handler)(2, None)  # SIGINT
+
+    assert getattr(killer, flag) is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -6,12 +6,9 @@ Tests:
 - GPS NMEA parsing and MQTT publishing
 - IMU data processing and complementary filter
 - MQTT connection and error handling
-- Graceful shutdown behavior
 """
 
-import json
 import pytest
-import tempfile
 import time
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
@@ -20,8 +17,12 @@ import sys
 sys.path.append(str(Path(__file__).parent.parent.parent / "src"))
 
 # Import sensor modules
-from sensors.gps_reader import parse_nmea_to_fix, GracefulKiller as GPSKiller
-from sensors.imu_reader import complementary_filter, GracefulKiller as IMUKiller
+from sensors import gps_reader
+from sensors.gps_reader import parse_nmea_to_fix, publish_mqtt_fix, connect_serial_with_retries
+from sensors.imu_reader import (
+    complementary_filter, complementary_filter_batch,
+    publish_mqtt_imu_batch, read_accel_gyro
+)
 
 
 class TestGPSReader:
@@ -32,77 +33,56 @@ class TestGPSReader:
         # Valid GGA sentence
         gga_sentence = "$GPGGA,123519,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*47"
         
-        # Mock pynmea2.parse to return a GGA object
-        with patch('sensors.gps_reader.pynmea2.parse') as mock_parse:
-            mock_gga = Mock()
-            mock_gga.latitude = 48.1173
-            mock_gga.longitude = 11.5167
-            mock_gga.altitude = 545.4
-            mock_gga.num_sats = 8
-            mock_gga.horizontal_dil = 0.9
-            mock_gga.gps_qual = 1
-            mock_gga.timestamp = None
-            mock_parse.return_value = mock_gga
-            
-            fix = parse_nmea_to_fix(gga_sentence)
-            
-            assert fix is not None
-            assert fix["type"] == "GGA"
-            assert fix["lat"] == 48.1173
-            assert fix["lon"] == 11.5167
-            assert fix["alt"] == 545.4
-            assert fix["num_sats"] == 8
-            assert fix["hdop"] == 0.9
-            assert fix["quality"] == 1
+        fix = parse_nmea_to_fix(gga_sentence)
+        
+        assert fix is not None
+        assert fix["type"] == "GGA"
+        assert fix["timestamp"] == "12:35:19"
+        assert fix["lat"] == pytest.approx(48.1173, abs=1e-4)
+        assert fix["lon"] == pytest.approx(11.5167, abs=1e-4)
+        assert fix["alt"] == 545.4
+        assert fix["num_sats"] == 8
+        assert fix["hdop"] == 0.9
+        assert fix["quality"] == 1
     
     def test_parse_rmc_nmea(self):
         """Test parsing RMC NMEA sentence."""
         # Valid RMC sentence
         rmc_sentence = "$GPRMC,123519,A,4807.038,N,01131.000,E,022.4,084.4,230394,003.1,W*6A"
         
-        with patch('sensors.gps_reader.pynmea2.parse') as mock_parse:
-            mock_rmc = Mock()
-            mock_rmc.latitude = 48.1173
-            mock_rmc.longitude = 11.5167
-            mock_rmc.spd_over_grnd = 22.4
-            mock_rmc.true_course = 84.4
-            mock_rmc.status = 'A'
-            mock_rmc.datestamp = None
-            mock_rmc.timestamp = None
-            mock_parse.return_value = mock_rmc
-            
-            fix = parse_nmea_to_fix(rmc_sentence)
-            
-            assert fix is not None
-            assert fix["type"] == "RMC"
-            assert fix["lat"] == 48.1173
-            assert fix["lon"] == 11.5167
-            assert fix["spd_over_grnd"] == 22.4
-            assert fix["true_course"] == 84.4
-            assert fix["status"] == 'A'
+        fix = parse_nmea_to_fix(rmc_sentence)
+        
+        assert fix is not None
+        assert fix["type"] == "RMC"
+        assert fix["timestamp"] == "1994-03-23T12:35:19"
+        assert fix["lat"] == pytest.approx(48.1173, abs=1e-4)
+        assert fix["lon"] == pytest.approx(11.5167, abs=1e-4)
+        assert fix["spd_over_grnd"] == 22.4
+        assert fix["true_course"] == 84.4
+        assert fix["status"] == 'A'
+    
+    def test_parse_southern_western_hemisphere(self):
+        """Test S/W hemispheres produce negative coordinates."""
+        sentence = "$GPGGA,123519,4807.038,S,01131.000,W,1,08,0.9,545.4,M,46.9,M,,"
+        
+        fix = parse_nmea_to_fix(sentence)
+        
+        assert fix["lat"] == pytest.approx(-48.1173, abs=1e-4)
+        assert fix["lon"] == pytest.approx(-11.5167, abs=1e-4)
     
     def test_parse_invalid_nmea(self):
         """Test parsing invalid NMEA sentence."""
         invalid_sentence = "INVALID_NMEA_SENTENCE"
         
-        with patch('sensors.gps_reader.pynmea2.parse') as mock_parse:
-            mock_parse.side_effect = Exception("Parse error")
-            
-            fix = parse_nmea_to_fix(invalid_sentence)
-            
-            assert fix is None
-    
-    def test_graceful_killer(self):
-        """Test graceful killer signal handling."""
-        killer = GPSKiller()
-        
-        # Initially should not stop
-        assert killer.should_stop is False
+        fix = parse_nmea_to_fix(invalid_sentence)
         
-        # Simulate signal
-        killer._on_signal(2, None)  # SIGINT
+        assert fix is None
+    
+    def test_parse_bad_checksum(self):
+        """Test sentences with a wrong checksum are rejected."""
+        bad_sentence = "$GPGGA,123519,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*48"
         
-        assert killer.should_stop is True
+        assert parse_nmea_to_fix(bad_sentence) is None
 
 
 class TestIMUReader:
@@ -133,37 +113,33 @@ class TestIMUReader:
         dt = 0.02
         alpha = 0.98
         
-        pitch, roll = 0.0, 0.0
-        
-        # Run filter for multiple iterations
-        for _ in range(100):
-            pitch, roll = complementary_filter(ax, ay, az, gx, gy, dt, alpha, (pitch, roll))
+        # Run filter for multiple iterations in one call
+        pitch, roll = complementary_filter_batch([(ax, ay, az, gx, gy)] * 100, dt, alpha, (0.0, 0.0))
         
         # Should converge to near-zero angles for stationary IMU
         assert abs(pitch) < 5.0  # Within 5 degrees
         assert abs(roll) < 5.0
     
-    def test_graceful_killer(self):
-        """Test graceful killer signal handling."""
-        killer = IMUKiller()
+    def test_complementary_filter_batch_matches_single(self):
+        """Test batch filter gives the same result as repeated single steps."""
+        samples = [(0.1, -0.2, 1.0, 0.5, 0.3), (0.0, 0.1, 0.98, -0.4, 0.2)] * 10
+        dt, alpha = 0.02, 0.98
         
-        # Initially should not stop
-        assert killer.stop is False
-        
-        # Simulate signal
-        killer._on(2, None)  # SIGINT
+        pitch, roll = 0.0, 0.0
+        for ax, ay, az, gx, gy in samples:
+            pitch, roll = complementary_filter(ax, ay, az, gx, gy, dt, alpha, (pitch, roll))
         
-        assert killer.stop is True
+        batch_pitch, batch_roll = complementary_filter_batch(samples, dt, alpha, (0.0, 0.0))
+        assert batch_pitch == pytest.approx(pitch)
+        assert batch_roll == pytest.approx(roll)
 
 
 class TestMQTTIntegration:
     """Test MQTT integration for sensors."""
     
     @patch('sensors.gps_reader.mqtt.Client')
-    def test_gps_mqtt_publish(self, mock_mqtt_client):
+    def test_gps_mqtt_publish(self, mock_mqtt_client, assert_published):
         """Test GPS MQTT publishing."""
-        from sensors.gps_reader import publish_mqtt_fix
-        
         # Mock MQTT client
         mock_client = Mock()
         mock_result = Mock()
@@ -182,48 +158,21 @@ class TestMQTTIntegration:
         # Publish fix
         publish_mqtt_fix(mock_client, fix)
         
-        # Verify MQTT publish was called
-        mock_client.publish.assert_called_once()
-        call_args = mock_client.publish.call_args
-        
-        # Check topic and payload
-        assert "drone/test-drone/gps" in call_args[0][0]
-        payload = json.loads(call_args[0][1])
-        assert payload["lat"] == 37.7749
-        assert payload["lon"] == -122.4194
+        # Verify MQTT publish was called with the fix
+        assert_published(mock_client, gps_reader.MQTT_TOPIC, lat=37.7749, lon=-122.4194)
     
-    @patch('sensors.imu_reader.mqtt.Client')
-    def test_imu_mqtt_publish(self, mock_mqtt_client):
-        """Test IMU MQTT publishing."""
-        from sensors.imu_reader import publish_mqtt_imu
-        
-        # Mock MQTT client
+    def test_imu_mqtt_publish_batch(self, assert_published):
+        """Test IMU samples are published as one batched message."""
         mock_client = Mock()
-        mock_result = Mock()
-        mock_result.wait_for_publish.return_value = None
-        mock_client.publish.return_value = mock_result
-        
-        # Test IMU sample
-        sample = {
-            "ts": 1234567890.0,
-            "accel": {"x_g": 0.1, "y_g": -0.2, "z_g": 1.0},
-            "gyro": {"x_dps": 0.5, "y_dps": 0.3, "z_dps": 0.2},
-            "est": {"pitch_deg": 1.2, "roll_deg": -0.8}
-        }
+        samples = [
+            {"ts": 1.0, "est": {"pitch_deg": 0.1, "roll_deg": 0.2}},
+            {"ts": 2.0, "est": {"pitch_deg": 0.3, "roll_deg": 0.4}},
+        ]
         
-        # Publish sample
-        publish_mqtt_imu(mock_client, sample)
+        publish_mqtt_imu_batch(mock_client, samples)
         
-        # Verify MQTT publish was called
-        mock_client.publish.assert_called_once()
-        call_args = mock_client.publish.call_args
-        
-        # Check topic and payload
-        assert "drone/pi-drone-01/imu" in call_args[0][0]
-        payload = json.loads(call_args[0][1])
-        assert payload["ts"] == 1234567890.0
-        assert payload["accel"]["x_g"] == 0.1
-        assert payload["est"]["pitch_deg"] == 1.2
+        payload = assert_published(mock_client, "drone/pi-drone-01/imu", device_id="pi-drone-01")
+        assert [s["ts"] for s in payload["samples"]] == [1.0, 2.0]
 
 
 class TestErrorHandling:
@@ -234,21 +183,18 @@ class TestErrorHandling:
         with patch('sensors.gps_reader.serial.Serial') as mock_serial:
             mock_serial.side_effect = Exception("Serial connection failed")
             
-            from sensors.gps_reader import connect_serial_with_retries
-            
             # Should raise exception after retries
             with pytest.raises(Exception):
                 connect_serial_with_retries("/dev/ttyUSB0", 9600, retries=1)
     
     def test_imu_i2c_error_handling(self):
-        """Test IMU I2C error handling."""
-        with patch('sensors.imu_reader.SMBus') as mock_smbus:
-            mock_bus = Mock()
-            mock_bus.read_byte_data.side_effect = Exception("I2C read failed")
-            mock_smbus.return_value.__enter__.return_value = mock_bus
-            
-            # Should handle I2C errors gracefully
-            # This would be tested in integration tests with actual hardware
+        """Test IMU I2C read errors reach run()'s per-sample error handler."""
+        mock_bus = Mock()
+        mock_bus.read_i2c_block_data.side_effect = OSError("I2C read failed")
+        
+        # read_accel_gyro must not swallow the error; run() logs and retries
+        with pytest.raises(OSError):
+            read_accel_gyro(mock_bus)
 
 
 if __name__ == "__main__":